@@ -1,251 +1,17 @@
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
-from textblob import TextBlob
-import random
 import datetime
-import json
-import requests
-import wikipediaapi
-import numpy as np
-import pickle
-import os
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from chatbot_engine import ChatbotEngine
 
-# =============================================================================
-# 1. KNOWLEDGE BASE (Put this at the top)
-# =============================================================================
-
-knowledge = {
-    "greetings": {
-        "patterns": ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"],
-        "responses": [
-            "Hello! How can I assist you today?",
-            "Hi there! What can I help you with?",
-            "Hey! Nice to see you. How can I be of service?"
-        ]
-    },
-    "name": {
-        "patterns": ["what is your name", "who are you", "your name"],
-        "responses": [
-            "My name is CodetechBot, your virtual assistant!",
-            "I'm CodetechBot, here to help you with your queries.",
-            "You can call me CodetechBot. I'm your friendly chatbot."
-        ]
-    },
-    # ... (include all your existing knowledge categories from previous code)
-}
-
-advanced_knowledge = {
-    "machine_learning": {
-        "patterns": ["machine learning", "neural network", "ai model", "deep learning"],
-        "responses": [
-            "I use machine learning algorithms to improve my responses over time!",
-            "My architecture includes neural networks for pattern recognition in conversations.",
-            "I'm constantly learning from interactions to provide better assistance."
-        ]
-    },
-    "memory": {
-        "patterns": ["remember", "memory", "recall", "previous conversation"],
-        "responses": [
-            "I can remember our recent conversations and use that context to help you better!",
-            "My memory system stores our interactions to provide more personalized responses.",
-            "I maintain conversation history to understand context and your preferences."
-        ]
-    }
-}
-
-# Merge knowledge bases
-knowledge.update(advanced_knowledge)
-
-fallback_responses = [
-    "I'm not sure I understand. Could you rephrase that?",
-    "That's an interesting question! I'm still learning though.",
-    "I don't have information about that yet. Try asking something else!",
-    "Hmm, I'm not programmed to answer that. Maybe ask me about my capabilities?",
-    "I'm still learning! Could you try a different question?"
-]
-
-commands_info = """
-🤖 **CodetechBot Commands Guide** 🤖
-**Basic Commands:**
-- hello/hi/greetings: Start a conversation
-- help: Show this help message
-- exit/quit: Close the chatbot
-**Advanced Features:**
-- Weather in [city]: Get weather information
-- Wikipedia [topic]: Get Wikipedia summary
-- News: Get latest headlines
-- I remember: Test my memory
-"""
-
-# =============================================================================
-# 2. MACHINE LEARNING COMPONENT (Add this after knowledge base)
-# =============================================================================
-
-class MLChatbot:
-    def __init__(self):
-        self.model = None
-        self.vectorizer = None
-        self.load_or_train_model()
-    
-    def load_or_train_model(self):
-        if os.path.exists('chatbot_model.h5') and os.path.exists('vectorizer.pkl'):
-            try:
-                # In a real implementation, you'd load TensorFlow model here
-                print("ML model loaded successfully!")
-            except:
-                self.train_model()
-        else:
-            self.train_model()
-    
-    def train_model(self):
-        print("Training ML model... (Placeholder - would train in production)")
-        # This is simplified - real implementation would train on actual data
-
-# =============================================================================
-# 3. CONVERSATION MEMORY (Add this after ML component)
-# =============================================================================
-
-class ConversationMemory:
-    def __init__(self, max_memory_size=100):
-        self.memory = []
-        self.max_memory_size = max_memory_size
-        self.user_context = {}
-        self.load_memory()
-    
-    def add_interaction(self, user_message, bot_response, sentiment):
-        interaction = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'user_message': user_message,
-            'bot_response': bot_response,
-            'sentiment': sentiment,
-            'context_clues': self.extract_context_clues(user_message)
-        }
-        
-        self.memory.append(interaction)
-        
-        if len(self.memory) > self.max_memory_size:
-            self.memory.pop(0)
-        
-        self.save_memory()
-        self.update_user_context(user_message, bot_response)
-    
-    def extract_context_clues(self, message):
-        clues = {}
-        message_lower = message.lower()
-        
-        if 'my name is' in message_lower:
-            name = message_lower.split('my name is')[-1].strip()
-            clues['user_name'] = name.title()
-        
-        if 'i live in' in message_lower:
-            location = message_lower.split('i live in')[-1].strip()
-            clues['user_location'] = location.title()
-        
-        return clues
-    
-    def update_user_context(self, user_message, bot_response):
-        clues = self.extract_context_clues(user_message)
-        
-        if 'user_name' in clues:
-            self.user_context['user_name'] = clues['user_name']
-        
-        if 'user_location' in clues:
-            self.user_context['user_location'] = clues['user_location']
-    
-    def get_recent_context(self, lookback_minutes=30):
-        cutoff_time = datetime.datetime.now() - datetime.timedelta(minutes=lookback_minutes)
-        recent = []
-        
-        for interaction in self.memory:
-            if datetime.datetime.fromisoformat(interaction['timestamp']) > cutoff_time:
-                recent.append(interaction)
-        
-        return recent
-    
-    def save_memory(self):
-        try:
-            with open('conversation_memory.json', 'w') as f:
-                json.dump({
-                    'memory': self.memory,
-                    'user_context': self.user_context
-                }, f, indent=2)
-        except Exception as e:
-            print(f"Error saving memory: {e}")
-    
-    def load_memory(self):
-        try:
-            with open('conversation_memory.json', 'r') as f:
-                data = json.load(f)
-                self.memory = data.get('memory', [])
-                self.user_context = data.get('user_context', {})
-        except FileNotFoundError:
-            self.memory = []
-            self.user_context = {}
-
-# =============================================================================
-# 4. API INTEGRATIONS (Add this after memory)
-# =============================================================================
-
-class APIIntegrations:
-    def __init__(self):
-        self.weather_api_key = "YOUR_OPENWEATHER_API_KEY"
-        self.wiki_wiki = wikipediaapi.Wikipedia(
-            user_agent='CodetechBot/1.0 (https://example.com; email@example.com)',
-            language='en',
-            extract_format=wikipediaapi.ExtractFormat.WIKI
-        )
-    
-    def get_weather(self, location):
-        try:
-            if not self.weather_api_key or self.weather_api_key == "YOUR_OPENWEATHER_API_KEY":
-                return "I need a weather API key to provide live weather data. You can get one from https://openweathermap.org"
-            
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={location}&appid={self.weather_api_key}&units=metric"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['main']['temp']
-                desc = data['weather'][0]['description']
-                humidity = data['main']['humidity']
-                return f"🌤️ Weather in {location}: {desc.title()}, Temperature: {temp}°C, Humidity: {humidity}%"
-            else:
-                return f"❌ Sorry, I couldn't fetch weather for {location}. Please check the city name."
-        except Exception as e:
-            return "⚠️ Weather service is currently unavailable."
-
-    def get_wikipedia_summary(self, topic):
-        try:
-            page = self.wiki_wiki.page(topic)
-            if page.exists():
-                summary = page.summary[:400] + "..." if len(page.summary) > 400 else page.summary
-                return f"📚 Wikipedia: {summary}"
-            else:
-                return f"❌ I couldn't find information about '{topic}' on Wikipedia."
-        except Exception as e:
-            return "⚠️ Wikipedia service is currently unavailable."
-
-    def get_news_headlines(self, category="general"):
-        try:
-            # Note: You need to get an API key from newsapi.org
-            api_key = "YOUR_NEWS_API_KEY"
-            if api_key == "YOUR_NEWS_API_KEY":
-                return "📰 To get news headlines, please get a free API key from https://newsapi.org and replace 'YOUR_NEWS_API_KEY' in the code."
-            
-            url = f"https://newsapi.org/v2/top-headlines?category={category}&country=us&apiKey={api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                headlines = [article['title'] for article in data['articles'][:3]]
-                return "📰 Top News:\n• " + "\n• ".join(headlines)
-            else:
-                return "❌ Sorry, I couldn't fetch news headlines at the moment."
-        except Exception as e:
-            return "⚠️ News service is currently unavailable."
+# How often the Tk loop checks for finished replies
+POLL_INTERVAL_MS = 50
 
 # =============================================================================
-# 5. MAIN CHATBOT APPLICATION (Add this last)
+# 1. MAIN CHATBOT APPLICATION (GUI client of ChatbotEngine)
 # =============================================================================
 
 class EnhancedChatbotApp:
@@ -255,12 +21,24 @@ class EnhancedChatbotApp:
         master.configure(bg='#f0f0f0')
         master.geometry("600x700")
         
-        # Initialize advanced components
-        self.ml_chatbot = MLChatbot()
-        self.conversation_memory = ConversationMemory()
-        self.api_integrations = APIIntegrations()
+        # Response logic lives in the headless engine
+        self.engine = ChatbotEngine()
+        
+        # Turns run off the Tk thread, on a single worker: each turn reads
+        # and writes the conversation memory, so they must run one after
+        # another in the order they were sent. Finished turns come back
+        # through a thread-safe queue that the Tk loop polls.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chatbot-worker")
+        self.results = queue.Queue()
+        self.request_ids = itertools.count(1)
+        # request id -> (message, future, cancel event), in submission order
+        self.in_flight = {}
+        self.finished = set()
         
         self.setup_gui()
+        self.master.bind('<Escape>', self.cancel_pending)
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.master.after(POLL_INTERVAL_MS, self.poll_results)
         
         # Welcome message
         self.write_message("🤖 CodetechBot AI: Hello! I'm your advanced AI assistant. I can remember our conversations, fetch real-time information, and learn from our interactions! Type 'help' for options.", "bot")
@@ -431,102 +209,73 @@ class EnhancedChatbotApp:
         self.write_message(user_message, "user")
         
         # Show typing indicator
-        self.status_var.set("🟡 Typing...")
-        self.master.update()
-        
-        # Process message with slight delay to simulate thinking
-        self.master.after(1000, lambda: self.process_and_respond(user_message))
-
-    def process_and_respond(self, user_message):
-        response = self.process_message(user_message)
-        
-        # Clear typing indicator
+        self.status_var.set("🟡 Typing... (Esc to cancel)")
+        
+        # A newer copy of a message still pending (e.g. a burst of clicks on
+        # one quick action) supersedes it, so only the latest one does work
+        superseded = [entry for entry in self.in_flight.values()
+                      if entry[0] == user_message and not entry[1].done()]
+        self.cancel(superseded)
+
+        request_id = next(self.request_ids)
+        cancelled = threading.Event()
+        future = self.executor.submit(self.engine.respond, user_message, cancelled)
+        self.in_flight[request_id] = (user_message, future, cancelled)
+        future.add_done_callback(lambda f, rid=request_id: self.results.put(rid))
+
+    def cancel(self, entries):
+        """Queued requests never start; a running one finishes without
+        storing anything in memory, and its reply is dropped."""
+        for _, future, cancelled in entries:
+            cancelled.set()
+            future.cancel()
+
+    def cancel_pending(self, event=None):
+        """Drop every outstanding request."""
+        pending = [entry for entry in self.in_flight.values() if not entry[1].done()]
+        self.cancel(pending)
+        if pending:
+            self.write_message("Okay, I've cancelled the pending requests.", "bot")
         self.status_var.set("🟢 Online - Ready to chat")
-        
-        self.write_message(response, "bot")
-        
-        # Store in memory
-        sentiment = TextBlob(user_message).sentiment.polarity
-        self.conversation_memory.add_interaction(user_message, response, sentiment)
 
-    def process_message(self, user_message):
-        user_message_lower = user_message.lower()
-        
-        # Handle exit commands
-        if user_message_lower in ['exit', 'quit', 'bye', 'goodbye']:
-            return "Goodbye! Thanks for chatting with me. Have a wonderful day! 👋"
-        
-        # Handle help command
-        if user_message_lower in ['help', 'commands', 'what can you do']:
-            return commands_info
-        
-        # Check for API commands
-        if user_message_lower.startswith('weather in'):
-            location = user_message_lower.replace('weather in', '').strip()
-            return self.api_integrations.get_weather(location or "London")
-        
-        if 'news' in user_message_lower or 'headlines' in user_message_lower:
-            return self.api_integrations.get_news_headlines()
-        
-        if user_message_lower.startswith('wikipedia'):
-            topic = user_message_lower.replace('wikipedia', '').strip()
-            return self.api_integrations.get_wikipedia_summary(topic or "Artificial Intelligence")
-        
-        # Handle memory queries
-        if 'remember' in user_message_lower or 'memory' in user_message_lower:
-            return self.handle_memory_query()
-        
-        # Use context from memory for personalized responses
-        user_context = self.conversation_memory.user_context
-        personalized_response = ""
-        if 'user_name' in user_context:
-            personalized_response = f"By the way {user_context['user_name']}, "
-        
-        # Enhanced response finding with context awareness
-        response = self.find_enhanced_response(user_message_lower)
-        
-        if response:
-            return personalized_response + response if personalized_response else response
-        
-        # Fallback with sentiment analysis
-        sentiment = TextBlob(user_message).sentiment.polarity
-        
-        if sentiment > 0.3:
-            return personalized_response + "That's wonderful! " + random.choice(fallback_responses)
-        elif sentiment < -0.3:
-            return personalized_response + "I understand this might be frustrating. " + random.choice(fallback_responses)
-        else:
-            return personalized_response + random.choice(fallback_responses)
-
-    def handle_memory_query(self):
-        user_context = self.conversation_memory.user_context
-        memory_count = len(self.conversation_memory.memory)
-        
-        if not user_context and memory_count == 0:
-            return "I don't have much memory of our conversation yet. Keep chatting with me!"
-        
-        response = f"I remember our last {memory_count} conversations"
-        
-        if 'user_name' in user_context:
-            response += f" and that your name is {user_context['user_name']}"
-        
-        if 'user_location' in user_context:
-            response += f" and you live in {user_context['user_location']}"
-        
-        response += "! 😊"
-        return response
-
-    def find_enhanced_response(self, user_message):
-        # Check knowledge base
-        for category, data in knowledge.items():
-            for pattern in data['patterns']:
-                if pattern in user_message:
-                    return random.choice(data['responses'])
-        
-        return None
+    def poll_results(self):
+        while True:
+            try:
+                self.finished.add(self.results.get_nowait())
+            except queue.Empty:
+                break
+        # Replies are shown in the order their messages were sent
+        while self.in_flight:
+            request_id = next(iter(self.in_flight))
+            if request_id not in self.finished:
+                break
+            self.finished.discard(request_id)
+            _, future, _ = self.in_flight.pop(request_id)
+            if future.cancelled():
+                continue
+            try:
+                response = future.result()
+            except Exception as e:
+                response = f"⚠️ Sorry, something went wrong: {e}"
+            # None: cancelled while running, before anything was stored
+            if response is not None:
+                self.write_message(response, "bot")
+        
+        if not self.in_flight:
+            # Clear typing indicator
+            self.status_var.set("🟢 Online - Ready to chat")
+        self.master.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def on_close(self):
+        # A turn still running must not write memory after the final flush
+        for _, _, cancelled in self.in_flight.values():
+            cancelled.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.engine.conversation_memory.flush()
+        self.master.destroy()
 
 # =============================================================================
-# 6. RUN THE APPLICATION (At the very end)
+# 2. RUN THE APPLICATION (At the very end)
 # =============================================================================
 
 def main():
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_sentiment import build_messages
+from chatbot_engine import MLChatbot
+
+
+if __name__ == "__main__":
+    model_file = os.path.join(tempfile.mkdtemp(), "chatbot_model.npz")
+    ml_chatbot = MLChatbot(model_file=model_file)
+
+    tracemalloc.start()
+    ml_chatbot.load_or_train_model()
+    _, train_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    cold = MLChatbot(model_file=model_file)
+    cold.load_or_train_model()
+    load_time = time.perf_counter() - start
+
+    print(f"model file: {os.path.getsize(model_file) / 1024:.1f} KiB on disk, "
+          f"{cold.model.nbytes() / 1024:.0f} KiB in memory")
+    print(f"training peak allocations: {train_peak / 1024 / 1024:.1f} MiB")
+    print(f"load from disk: {load_time * 1000:.1f} ms")
+
+    for batch_size in (1, 100, 10_000):
+        messages = build_messages(batch_size)
+        start = time.perf_counter()
+        cold.predict_many(messages)
+        elapsed = time.perf_counter() - start
+        print(f"batch {batch_size:>6}: {elapsed * 1000:8.2f} ms total, "
+              f"{elapsed / batch_size * 1e6:8.1f} us/msg")
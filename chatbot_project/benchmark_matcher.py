@@ -0,0 +1,74 @@
+import random
+import string
+import time
+
+from intent_matcher import IntentMatcher
+
+
+def random_word(rng, size):
+    return ''.join(rng.choices(string.ascii_lowercase, k=size))
+
+
+def build_knowledge(num_patterns, patterns_per_category=10, seed=42):
+    """Build a synthetic knowledge dict with `num_patterns` patterns."""
+    rng = random.Random(seed)
+    knowledge = {}
+    for i in range(0, num_patterns, patterns_per_category):
+        knowledge[f"intent_{i}"] = {
+            "patterns": [
+                f"{random_word(rng, 5)} {random_word(rng, 6)}"
+                for _ in range(patterns_per_category)
+            ],
+            "responses": ["ok"],
+        }
+    return knowledge
+
+
+def build_messages(knowledge, count=200, seed=7):
+    """Mix messages that hit a known pattern with messages that miss."""
+    rng = random.Random(seed)
+    patterns = [p for data in knowledge.values() for p in data["patterns"]]
+    messages = []
+    for i in range(count):
+        words = [random_word(rng, rng.randint(2, 8)) for _ in range(12)]
+        if i % 2 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(patterns))
+        messages.append(' '.join(words))
+    return messages
+
+
+def naive_best(knowledge, message):
+    for category, data in knowledge.items():
+        for pattern in data['patterns']:
+            if pattern in message:
+                return category
+    return None
+
+
+def run(num_patterns, naive_messages=20):
+    knowledge = build_knowledge(num_patterns)
+    messages = build_messages(knowledge)
+
+    start = time.perf_counter()
+    matcher = IntentMatcher(knowledge)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [matcher.best(m) for m in messages]
+    matcher_latency = (time.perf_counter() - start) / len(messages)
+
+    sample = messages[:naive_messages]
+    start = time.perf_counter()
+    expected = [naive_best(knowledge, m) for m in sample]
+    naive_latency = (time.perf_counter() - start) / len(sample)
+
+    assert results[:naive_messages] == expected, "matcher disagrees with nested loop"
+
+    print(f"{num_patterns:>7} patterns | build {build_time:7.2f} s | "
+          f"automaton {matcher_latency * 1e6:9.1f} us/msg | "
+          f"nested loop {naive_latency * 1e6:11.1f} us/msg")
+
+
+if __name__ == "__main__":
+    for size in (10_000, 100_000):
+        run(size)
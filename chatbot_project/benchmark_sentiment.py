@@ -0,0 +1,45 @@
+import random
+import time
+
+import numpy as np
+
+from sentiment import LexiconSentiment, TextBlobSentiment
+
+OPENERS = ["I think", "Honestly", "Today", "My friend said", "The weather is", "This bot is", "Work was"]
+WORDS = ["great", "terrible", "not good", "really nice", "awful", "okay", "amazing", "boring",
+         "happy", "sad", "fine", "not bad", "wonderful", "horrible", "interesting", "slow"]
+TAILS = ["today", "right now", "as usual", "I guess", "for sure", "!", "again", ""]
+
+
+def build_messages(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(OPENERS)} {rng.choice(WORDS)} and {rng.choice(WORDS)} {rng.choice(TAILS)}"
+        for _ in range(count)
+    ]
+
+
+def bucket(scores):
+    scores = np.asarray(scores)
+    return np.where(scores > 0.3, 1, np.where(scores < -0.3, -1, 0))
+
+
+def throughput(backend, messages):
+    start = time.perf_counter()
+    scores = backend.polarity_many(messages)
+    elapsed = time.perf_counter() - start
+    return scores, len(messages) / elapsed
+
+
+if __name__ == "__main__":
+    messages = build_messages(5000)
+    textblob_scores, textblob_rate = throughput(TextBlobSentiment(), messages)
+    lexicon_scores, lexicon_rate = throughput(LexiconSentiment(), messages)
+
+    agreement = float(np.mean(bucket(textblob_scores) == bucket(lexicon_scores)))
+    correlation = float(np.corrcoef(textblob_scores, lexicon_scores)[0, 1])
+
+    print(f"textblob: {textblob_rate:10.0f} msg/s")
+    print(f"lexicon:  {lexicon_rate:10.0f} msg/s ({lexicon_rate / textblob_rate:.1f}x)")
+    print(f"bucket agreement (+/-0.3 thresholds): {agreement:.1%}")
+    print(f"polarity correlation: {correlation:.3f}")
@@ -3,6 +3,7 @@ from tkinter.scrolledtext import ScrolledText
 from textblob import TextBlob
 import random
 import datetime
+from intent_matcher import IntentMatcher
 
 # Expanded knowledge base
 knowledge = {
@@ -86,6 +87,9 @@ knowledge = {
     }
 }
 
+# Compiled once, shared by every lookup
+intent_matcher = IntentMatcher(knowledge)
+
 # Fallback responses for unknown queries
 fallback_responses = [
     "I'm not sure I understand. Could you rephrase that?",
@@ -210,11 +214,10 @@ class ChatbotApp:
         """Find the best matching response from knowledge base"""
         user_message_lower = user_message.lower()
         
-        # Check for exact matches in patterns
-        for category, data in knowledge.items():
-            for pattern in data['patterns']:
-                if pattern in user_message_lower:
-                    return random.choice(data['responses'])
+        # Check for pattern matches in a single pass
+        category = intent_matcher.best(user_message_lower)
+        if category:
+            return random.choice(knowledge[category]['responses'])
         
         return None
     
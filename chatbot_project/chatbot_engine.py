@@ -0,0 +1,484 @@
+import random
+import datetime
+import json
+import requests
+import wikipediaapi
+import numpy as np
+import os
+import threading
+import time
+from api_cache import TTLCache
+from intent_classifier import BACKGROUND, IntentClassifier, knowledge_fingerprint
+from intent_matcher import IntentMatcher
+from memory_index import MemoryIndex
+from memory_store import MemoryLogStore
+from sentiment import SentimentAnalyzer
+
+# =============================================================================
+# 1. KNOWLEDGE BASE (Put this at the top)
+# =============================================================================
+
+knowledge = {
+    "greetings": {
+        "patterns": ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"],
+        "responses": [
+            "Hello! How can I assist you today?",
+            "Hi there! What can I help you with?",
+            "Hey! Nice to see you. How can I be of service?"
+        ]
+    },
+    "name": {
+        "patterns": ["what is your name", "who are you", "your name"],
+        "responses": [
+            "My name is CodetechBot, your virtual assistant!",
+            "I'm CodetechBot, here to help you with your queries.",
+            "You can call me CodetechBot. I'm your friendly chatbot."
+        ]
+    },
+}
+
+advanced_knowledge = {
+    "machine_learning": {
+        "patterns": ["machine learning", "neural network", "ai model", "deep learning"],
+        "responses": [
+            "I use machine learning algorithms to improve my responses over time!",
+            "My architecture includes neural networks for pattern recognition in conversations.",
+            "I'm constantly learning from interactions to provide better assistance."
+        ]
+    },
+    "memory": {
+        "patterns": ["remember", "memory", "recall", "previous conversation"],
+        "responses": [
+            "I can remember our recent conversations and use that context to help you better!",
+            "My memory system stores our interactions to provide more personalized responses.",
+            "I maintain conversation history to understand context and your preferences."
+        ]
+    }
+}
+
+# Merge knowledge bases
+knowledge.update(advanced_knowledge)
+
+# Compiled once, shared by every lookup
+intent_matcher = IntentMatcher(knowledge)
+
+fallback_responses = [
+    "I'm not sure I understand. Could you rephrase that?",
+    "That's an interesting question! I'm still learning though.",
+    "I don't have information about that yet. Try asking something else!",
+    "Hmm, I'm not programmed to answer that. Maybe ask me about my capabilities?",
+    "I'm still learning! Could you try a different question?"
+]
+
+commands_info = """
+🤖 **CodetechBot Commands Guide** 🤖
+**Basic Commands:**
+- hello/hi/greetings: Start a conversation
+- help: Show this help message
+- exit/quit: Close the chatbot
+**Advanced Features:**
+- Weather in [city]: Get weather information
+- Wikipedia [topic]: Get Wikipedia summary
+- News: Get latest headlines
+- I remember: Test my memory
+"""
+
+def command_for(user_message_lower):
+    """The command a lowercased message invokes, or None for normal chat."""
+    if user_message_lower in ['exit', 'quit', 'bye', 'goodbye']:
+        return 'exit'
+    if user_message_lower in ['help', 'commands', 'what can you do']:
+        return 'help'
+    if user_message_lower.startswith('weather in'):
+        return 'weather'
+    if 'news' in user_message_lower or 'headlines' in user_message_lower:
+        return 'news'
+    if user_message_lower.startswith('wikipedia'):
+        return 'wikipedia'
+    if 'remember' in user_message_lower or 'memory' in user_message_lower:
+        return 'memory'
+    return None
+
+# =============================================================================
+# 2. MACHINE LEARNING COMPONENT (Add this after knowledge base)
+# =============================================================================
+
+class MLChatbot:
+    """Intent classifier used when keyword matching finds nothing.
+
+    The model is trained from the knowledge base patterns plus a background
+    class of generic chatter; messages closest to the background, or whose
+    best category scores under `threshold`, get no category. It is saved to
+    `model_file` and loaded lazily on the first prediction. A saved model is
+    retrained if the knowledge base has changed since it was written.
+    """
+
+    def __init__(self, model_file='chatbot_model.npz', threshold=0.25, knowledge_base=None):
+        self.model = None
+        self.model_file = model_file
+        self.threshold = threshold
+        self.knowledge = knowledge_base or knowledge
+        self.load_lock = threading.Lock()
+    
+    def load_or_train_model(self):
+        with self.load_lock:
+            if self.model is not None:
+                return self.model
+            fingerprint = knowledge_fingerprint(self.knowledge)
+            if os.path.exists(self.model_file):
+                try:
+                    model = IntentClassifier.load(self.model_file)
+                    if model.fingerprint == fingerprint:
+                        self.model = model
+                        return self.model
+                except Exception as e:
+                    print(f"Error loading ML model: {e}")
+            self.model = self.train_model()
+            return self.model
+    
+    def train_model(self):
+        start = time.perf_counter()
+        model = IntentClassifier(list(self.knowledge) + [BACKGROUND]).fit(self.knowledge)
+        elapsed = time.perf_counter() - start
+        try:
+            model.save(self.model_file)
+        except OSError as e:
+            print(f"Error saving ML model: {e}")
+        print(f"ML intent model trained in {elapsed:.2f}s ({model.nbytes() / 1024:.0f} KiB in memory)")
+        return model
+    
+    def predict_many(self, messages):
+        """Best category per message, or None when the model is not confident."""
+        if not messages:
+            return []
+        return self.load_or_train_model().predict(messages, self.threshold)
+
+# =============================================================================
+# 3. CONVERSATION MEMORY (Add this after ML component)
+# =============================================================================
+
+class ConversationMemory:
+    def __init__(self, max_memory_size=100, memory_file='conversation_memory.jsonl'):
+        # Bounded, time-sorted window: trimming is amortized O(1) and
+        # lookbacks are a bisect over numeric timestamps
+        self.memory = MemoryIndex(maxlen=max_memory_size)
+        self.max_memory_size = max_memory_size
+        self.memory_file = memory_file
+        self.store = MemoryLogStore(memory_file, compact_after=4 * max_memory_size) if memory_file else None
+        self.user_context = {}
+        self.load_memory()
+    
+    def add_interaction(self, user_message, bot_response, sentiment):
+        now = datetime.datetime.now()
+        interaction = {
+            'timestamp': now.isoformat(),
+            'ts': now.timestamp(),
+            'user_message': user_message,
+            'bot_response': bot_response,
+            'sentiment': sentiment,
+            'context_clues': self.extract_context_clues(user_message)
+        }
+        
+        self.memory.append(interaction)
+        self.update_user_context(user_message, bot_response)
+        self.save_memory(interaction)
+    
+    def extract_context_clues(self, message):
+        clues = {}
+        message_lower = message.lower()
+        
+        if 'my name is' in message_lower:
+            name = message_lower.split('my name is')[-1].strip()
+            clues['user_name'] = name.title()
+        
+        if 'i live in' in message_lower:
+            location = message_lower.split('i live in')[-1].strip()
+            clues['user_location'] = location.title()
+        
+        return clues
+    
+    def update_user_context(self, user_message, bot_response):
+        clues = self.extract_context_clues(user_message)
+        
+        if 'user_name' in clues:
+            self.user_context['user_name'] = clues['user_name']
+        
+        if 'user_location' in clues:
+            self.user_context['user_location'] = clues['user_location']
+    
+    def get_recent_context(self, lookback_minutes=30):
+        cutoff_time = datetime.datetime.now() - datetime.timedelta(minutes=lookback_minutes)
+        return self.memory.since(cutoff_time.timestamp())
+    
+    def get_interactions_with(self, clue, value):
+        """Interactions where the user mentioned e.g. ('user_name', 'Sam')."""
+        return self.memory.with_clue(clue, value)
+    
+    def get_interactions_by_sentiment(self, bucket):
+        return self.memory.with_sentiment(bucket)
+    
+    def get_sentiment_summary(self):
+        return self.memory.sentiment_counts()
+    
+    def save_memory(self, interaction):
+        if self.store is None:
+            return
+        self.store.append(interaction)
+        if self.store.needs_compaction():
+            self.store.compact_in_background(list(self.memory), dict(self.user_context))
+    
+    def flush(self):
+        if self.store is not None:
+            self.store.flush()
+    
+    def load_memory(self):
+        if self.store is None:
+            return
+        for record in self.store.load():
+            if 'user_context' in record:
+                self.user_context.update(record['user_context'])
+            else:
+                self.memory.append(record)
+                self.user_context.update(record.get('context_clues', {}))
+        if not self.memory and not self.user_context:
+            self.load_legacy_memory()
+    
+    def load_legacy_memory(self):
+        """Import a pre-JSONL conversation_memory.json snapshot if one exists."""
+        legacy_file = os.path.splitext(self.memory_file)[0] + '.json'
+        if legacy_file == self.memory_file or not os.path.exists(legacy_file):
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading legacy memory: {e}")
+            return
+        self.memory.extend(data.get('memory', []))
+        self.user_context.update(data.get('user_context', {}))
+        self.store.compact(list(self.memory), dict(self.user_context))
+
+# =============================================================================
+# 4. API INTEGRATIONS (Add this after memory)
+# =============================================================================
+
+class APIIntegrations:
+    WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+    NEWS_URL = "https://newsapi.org/v2/top-headlines"
+
+    def __init__(self, timeout=5, weather_ttl=600, wiki_ttl=86400, news_ttl=300, cache_size=512):
+        self.weather_api_key = "YOUR_OPENWEATHER_API_KEY"
+        # Note: You need to get an API key from newsapi.org
+        self.news_api_key = "YOUR_NEWS_API_KEY"
+        self.timeout = timeout
+        # One pooled session so repeated calls reuse connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.wiki_wiki = wikipediaapi.Wikipedia(
+            user_agent='CodetechBot/1.0 (https://example.com; email@example.com)',
+            language='en',
+            extract_format=wikipediaapi.ExtractFormat.WIKI,
+            timeout=timeout
+        )
+        self.caches = {
+            'weather': TTLCache(weather_ttl, cache_size),
+            'wikipedia': TTLCache(wiki_ttl, cache_size),
+            'news': TTLCache(news_ttl, cache_size),
+        }
+    
+    def cache_stats(self):
+        return {name: cache.stats() for name, cache in self.caches.items()}
+    
+    def get_weather(self, location):
+        if not self.weather_api_key or self.weather_api_key == "YOUR_OPENWEATHER_API_KEY":
+            return "I need a weather API key to provide live weather data. You can get one from https://openweathermap.org"
+        try:
+            return self.caches['weather'].get_or_load(
+                location.strip().lower(), lambda: self.fetch_weather(location)
+            )
+        except Exception as e:
+            return "⚠️ Weather service is currently unavailable."
+
+    def fetch_weather(self, location):
+        response = self.session.get(
+            self.WEATHER_URL,
+            params={'q': location, 'appid': self.weather_api_key, 'units': 'metric'},
+            timeout=self.timeout
+        )
+        # An unknown city is a real answer and is cached like one
+        if response.status_code == 404:
+            return f"❌ Sorry, I couldn't fetch weather for {location}. Please check the city name."
+        # Anything else that is not a weather report raises, so it is not
+        # cached and the next request tries again
+        response.raise_for_status()
+        data = response.json()
+        temp = data['main']['temp']
+        desc = data['weather'][0]['description']
+        humidity = data['main']['humidity']
+        return f"🌤️ Weather in {location}: {desc.title()}, Temperature: {temp}°C, Humidity: {humidity}%"
+
+    def get_wikipedia_summary(self, topic):
+        try:
+            return self.caches['wikipedia'].get_or_load(
+                topic.strip().lower(), lambda: self.fetch_wikipedia_summary(topic)
+            )
+        except Exception as e:
+            return "⚠️ Wikipedia service is currently unavailable."
+
+    def fetch_wikipedia_summary(self, topic):
+        page = self.wiki_wiki.page(topic)
+        if page.exists():
+            summary = page.summary[:400] + "..." if len(page.summary) > 400 else page.summary
+            return f"📚 Wikipedia: {summary}"
+        else:
+            # A missing page is a real answer and is cached like one
+            return f"❌ I couldn't find information about '{topic}' on Wikipedia."
+
+    def get_news_headlines(self, category="general"):
+        if self.news_api_key == "YOUR_NEWS_API_KEY":
+            return "📰 To get news headlines, please get a free API key from https://newsapi.org and replace 'YOUR_NEWS_API_KEY' in the code."
+        try:
+            return self.caches['news'].get_or_load(category, lambda: self.fetch_news_headlines(category))
+        except Exception as e:
+            return "⚠️ News service is currently unavailable."
+
+    def fetch_news_headlines(self, category):
+        response = self.session.get(
+            self.NEWS_URL,
+            params={'category': category, 'country': 'us', 'apiKey': self.news_api_key},
+            timeout=self.timeout
+        )
+        # Errors raise, so they are not cached and the next request tries again
+        response.raise_for_status()
+        data = response.json()
+        headlines = [article['title'] for article in data['articles'][:3]]
+        return "📰 Top News:\n• " + "\n• ".join(headlines)
+
+
+# =============================================================================
+# 5. CHATBOT ENGINE (Headless, shared by every front end)
+# =============================================================================
+
+class ChatbotEngine:
+    """GUI-free response engine owning the knowledge base, memory and APIs."""
+
+    def __init__(self, conversation_memory=None, api_integrations=None, ml_chatbot=None, sentiment=None):
+        self.ml_chatbot = ml_chatbot or MLChatbot()
+        self.conversation_memory = conversation_memory or ConversationMemory()
+        self.api_integrations = api_integrations or APIIntegrations()
+        self.sentiment = sentiment or SentimentAnalyzer()
+        self.intent_matcher = intent_matcher
+        # Turns may run on several worker threads; only the memory update
+        # needs to be serialized, slow API and sentiment work does not.
+        self.memory_lock = threading.Lock()
+
+    def analyze_sentiment(self, message):
+        return self.sentiment.polarity(message)
+
+    def respond(self, user_message, cancelled=None):
+        """Return the bot's reply to one message and store the interaction.
+
+        Returns None, storing nothing, if the `cancelled` event was set first.
+        """
+        responses = self.respond_many([user_message], cancelled)
+        return responses[0] if responses else None
+
+    def respond_many(self, messages, cancelled=None):
+        """Reply to a batch of messages in order.
+
+        Lowercasing, intent lookup and sentiment are computed once per
+        distinct message in the batch; memory-dependent steps still run in
+        order so later messages see context learned from earlier ones.
+        Once the optional `cancelled` event is set no further interaction is
+        stored, and only the replies stored so far are returned.
+        """
+        lowered = {}
+        intents = {}
+        for message in messages:
+            if message in lowered:
+                continue
+            message_lower = message.lower()
+            lowered[message] = message_lower
+            if message_lower not in intents:
+                intents[message_lower] = self.intent_matcher.best(message_lower)
+        # Messages that are neither commands nor pattern matches go to the
+        # ML classifier in one batch
+        misses = [m for m, category in intents.items() if category is None and command_for(m) is None]
+        intents.update(zip(misses, self.ml_chatbot.predict_many(misses)))
+        unique = list(lowered)
+        sentiments = dict(zip(unique, self.sentiment.polarity_many(unique)))
+
+        responses = []
+        for message in messages:
+            message_lower = lowered[message]
+            sentiment = sentiments[message]
+            response = self.process_message(message_lower, intents[message_lower], sentiment)
+            with self.memory_lock:
+                if cancelled is not None and cancelled.is_set():
+                    break
+                self.conversation_memory.add_interaction(message, response, sentiment)
+            responses.append(response)
+        return responses
+
+    def process_message(self, user_message_lower, category, sentiment):
+        command = command_for(user_message_lower)
+        if command == 'exit':
+            return "Goodbye! Thanks for chatting with me. Have a wonderful day! 👋"
+        
+        if command == 'help':
+            return commands_info
+        
+        # API commands
+        if command == 'weather':
+            location = user_message_lower.replace('weather in', '').strip()
+            return self.api_integrations.get_weather(location or "London")
+        
+        if command == 'news':
+            return self.api_integrations.get_news_headlines()
+        
+        if command == 'wikipedia':
+            topic = user_message_lower.replace('wikipedia', '').strip()
+            return self.api_integrations.get_wikipedia_summary(topic or "Artificial Intelligence")
+        
+        if command == 'memory':
+            return self.handle_memory_query()
+        
+        # Use context from memory for personalized responses
+        user_context = self.conversation_memory.user_context
+        personalized_response = ""
+        if 'user_name' in user_context:
+            personalized_response = f"By the way {user_context['user_name']}, "
+        
+        # Enhanced response finding with context awareness
+        if category:
+            response = random.choice(knowledge[category]['responses'])
+            return personalized_response + response if personalized_response else response
+        
+        # Fallback with sentiment analysis
+        if sentiment > 0.3:
+            return personalized_response + "That's wonderful! " + random.choice(fallback_responses)
+        elif sentiment < -0.3:
+            return personalized_response + "I understand this might be frustrating. " + random.choice(fallback_responses)
+        else:
+            return personalized_response + random.choice(fallback_responses)
+
+    def handle_memory_query(self):
+        user_context = self.conversation_memory.user_context
+        memory_count = len(self.conversation_memory.memory)
+        
+        if not user_context and memory_count == 0:
+            return "I don't have much memory of our conversation yet. Keep chatting with me!"
+        
+        response = f"I remember our last {memory_count} conversations"
+        
+        if 'user_name' in user_context:
+            response += f" and that your name is {user_context['user_name']}"
+        
+        if 'user_location' in user_context:
+            response += f" and you live in {user_context['user_location']}"
+        
+        response += "! 😊"
+        return response
+
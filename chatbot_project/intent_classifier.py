@@ -0,0 +1,176 @@
+import hashlib
+import json
+import re
+import zlib
+
+import numpy as np
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Reject class: messages closer to this generic chatter than to any intent
+# get no category, so the engine falls back to its sentiment replies
+BACKGROUND = '_background'
+BACKGROUND_TEXTS = [
+    "my name is alex", "my name is maria", "call me jo", "i am john",
+    "i live in paris", "i'm from texas", "i work as a nurse", "i am a student",
+    "remind me to call mom", "set an alarm for seven", "add eggs to my shopping list",
+    "book a table for two", "order a pizza", "send an email to my boss",
+    "turn off the lights", "play my workout playlist", "call a taxi",
+    "what is the capital of spain", "how tall is mount everest", "who won the game last night",
+    "how many legs does a spider have", "what is 7 times 8", "translate cat into german",
+    "i had a long day", "my cat is hungry", "we went to the beach",
+    "i love chocolate cake", "the train was late again", "my phone is broken",
+    "i need to study for my exam", "the movie was boring", "it is my birthday next week",
+    "yes", "no", "maybe", "okay", "ok cool", "sure thing", "hmm", "haha", "whatever",
+    "i see", "right", "nevermind", "not really", "and then", "so what", "fine",
+    "asdf", "test", "blah blah", "what", "why", "really", "no idea",
+    "tomorrow morning", "next tuesday", "at the office", "in the kitchen",
+    "how are you", "how are you today", "how's it going", "how do you feel",
+    "are you ok", "what's up", "thank you so much", "thanks a lot", "good job",
+]
+
+
+def knowledge_fingerprint(knowledge, background=BACKGROUND_TEXTS):
+    """Stable hash of the patterns (and background texts) a model was trained on."""
+    patterns = {category: data['patterns'] for category, data in knowledge.items()}
+    patterns[BACKGROUND] = list(background)
+    return hashlib.sha1(json.dumps(patterns, sort_keys=True).encode()).hexdigest()
+
+
+class HashingVectorizer:
+    """Word unigram/bigram and character trigram features hashed with crc32.
+
+    crc32 is stable across processes, unlike hash(), so saved weights stay
+    valid. Rows are L2-normalized and returned in CSR form
+    (indptr, indices, data).
+    """
+
+    def __init__(self, n_features=2 ** 16):
+        self.n_features = n_features
+
+    def features(self, text):
+        words = WORD_RE.findall(text.lower())
+        feats = [f"w:{w}" for w in words]
+        feats += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            feats += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return feats
+
+    def transform(self, texts):
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = {}
+            for feat in self.features(text):
+                index = zlib.crc32(feat.encode()) % self.n_features
+                counts[index] = counts.get(index, 0) + 1
+            values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            norm = np.sqrt((values ** 2).sum()) or 1.0
+            indices.extend(counts.keys())
+            data.extend((values / norm).tolist())
+            indptr.append(len(indices))
+        return (
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(data, dtype=np.float32),
+        )
+
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed features, in NumPy.
+
+    Inference scores a whole batch with one sparse-dense product of the CSR
+    feature matrix and the weight matrix. Only weight rows touched during
+    training are saved, which keeps the file small. A BACKGROUND category,
+    trained on generic text, is never returned: it predicts None.
+    """
+
+    def __init__(self, categories, n_features=2 ** 16):
+        self.categories = list(categories)
+        self.vectorizer = HashingVectorizer(n_features)
+        self.weights = np.zeros((n_features, len(self.categories)), dtype=np.float32)
+        self.bias = np.zeros(len(self.categories), dtype=np.float32)
+        self.fingerprint = None
+
+    def decision_function(self, csr):
+        indptr, indices, data = csr
+        n_rows = len(indptr) - 1
+        rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+        scores = np.zeros((n_rows, len(self.categories)), dtype=np.float32)
+        np.add.at(scores, rows, self.weights[indices] * data[:, None])
+        return scores + self.bias
+
+    def predict_proba(self, texts):
+        return self.predict_proba_csr(self.vectorizer.transform(texts))
+
+    def predict_proba_csr(self, csr):
+        scores = self.decision_function(csr)
+        scores -= scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, texts, threshold=0.0):
+        """Best category per text, or None for background text or confidence below threshold."""
+        if not texts:
+            return []
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        return [
+            self.categories[b] if proba[i, b] >= threshold and self.categories[b] != BACKGROUND else None
+            for i, b in enumerate(best)
+        ]
+
+    def fit(self, knowledge, epochs=300, learning_rate=1.0, l2=1e-4, background=BACKGROUND_TEXTS):
+        texts = []
+        labels = []
+        for label, category in enumerate(self.categories):
+            patterns = background if category == BACKGROUND else knowledge[category]['patterns']
+            texts.extend(patterns)
+            labels.extend([label] * len(patterns))
+        indptr, indices, data = self.vectorizer.transform(texts)
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        targets = np.eye(len(self.categories), dtype=np.float32)[labels]
+        # Every category weighs the same in the loss however many examples it has,
+        # so the many background texts do not drown out the intents
+        counts = np.bincount(labels, minlength=len(self.categories))
+        sample_weight = (1.0 / (len(self.categories) * counts[labels])).astype(np.float32)[:, None]
+
+        # Full-batch gradient descent on the softmax cross-entropy
+        for _ in range(epochs):
+            proba = self.predict_proba_csr((indptr, indices, data))
+            error = (proba - targets) * sample_weight
+            grad = np.zeros_like(self.weights)
+            np.add.at(grad, indices, data[:, None] * error[rows])
+            touched = np.unique(indices)
+            grad[touched] += l2 * self.weights[touched]
+            self.weights -= learning_rate * grad
+            self.bias -= learning_rate * error.sum(axis=0)
+
+        self.fingerprint = knowledge_fingerprint(knowledge, background)
+        return self
+
+    def nbytes(self):
+        return self.weights.nbytes + self.bias.nbytes
+
+    def save(self, path):
+        rows = np.flatnonzero(np.any(self.weights != 0, axis=1))
+        np.savez_compressed(
+            path,
+            categories=np.array(self.categories),
+            n_features=self.vectorizer.n_features,
+            rows=rows.astype(np.int32),
+            row_weights=self.weights[rows],
+            bias=self.bias,
+            fingerprint=self.fingerprint or "",
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            model = cls(saved['categories'].tolist(), int(saved['n_features']))
+            model.weights[saved['rows']] = saved['row_weights']
+            model.bias = saved['bias']
+            model.fingerprint = str(saved['fingerprint'])
+        return model
@@ -0,0 +1,82 @@
+from collections import deque
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton over the patterns of a knowledge dict.
+
+    The automaton is built once and then finds every matching intent in a
+    single pass over the message. Matching keeps the substring semantics of
+    the original `pattern in message` loop. Priority is deterministic: intents
+    are ranked by their position in the knowledge dict, so `best()` returns
+    the same category the nested loop used to return.
+    """
+
+    def __init__(self, knowledge):
+        self.categories = list(knowledge.keys())
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        self.pattern_count = 0
+
+        for priority, category in enumerate(self.categories):
+            for pattern in knowledge[category]['patterns']:
+                self.add_pattern(pattern.lower(), priority)
+
+        self.build_links()
+
+    def add_pattern(self, pattern, priority):
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            node = next_node
+        if priority not in self.output[node]:
+            self.output[node] = self.output[node] + (priority,)
+        self.pattern_count += 1
+
+    def build_links(self):
+        """Compute failure links breadth-first and fold outputs along them."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                inherited = self.output[self.fail[child]]
+                if inherited:
+                    self.output[child] = tuple(sorted(set(self.output[child]) | set(inherited)))
+        self.output = [tuple(sorted(out)) for out in self.output]
+
+    def match_priorities(self, message):
+        """Return the sorted priorities of every intent found in `message`."""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        found = set()
+        node = 0
+        for char in message.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return sorted(found)
+
+    def match(self, message):
+        """Return all matching categories, highest priority first."""
+        return [self.categories[p] for p in self.match_priorities(message)]
+
+    def best(self, message):
+        """Return the highest priority matching category, or None."""
+        priorities = self.match_priorities(message)
+        return self.categories[priorities[0]] if priorities else None
@@ -0,0 +1,116 @@
+import bisect
+import datetime
+from collections import defaultdict, deque
+
+
+def sentiment_bucket(polarity):
+    """Bucket a polarity score with the same thresholds the engine uses."""
+    if polarity > 0.3:
+        return 'positive'
+    if polarity < -0.3:
+        return 'negative'
+    return 'neutral'
+
+
+def record_time(record):
+    """Numeric timestamp of a record, parsing the ISO string for old records."""
+    if 'ts' in record:
+        return record['ts']
+    return datetime.datetime.fromisoformat(record['timestamp']).timestamp()
+
+
+class MemoryIndex:
+    """Bounded, time-sorted window of interactions with secondary indexes.
+
+    Records live in a list that is only appended to; trimming advances a start
+    offset and the dead prefix is dropped once it outgrows the live part, so
+    trimming stays amortized O(1). A parallel list of numeric timestamps makes
+    a lookback window one bisect plus a slice. Secondary indexes map each
+    context clue and sentiment bucket to the absolute positions of matching
+    records; a record's positions leave them when it leaves the window, and
+    keys with no positions left are deleted, so the indexes stay bounded too.
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.records = []
+        self.times = []
+        self.start = 0
+        self.offset = 0
+        self.by_clue = defaultdict(deque)
+        self.by_sentiment = defaultdict(deque)
+
+    def __len__(self):
+        return len(self.records) - self.start
+
+    def __iter__(self):
+        return iter(self.records[self.start:])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("memory index out of range")
+        return self.records[self.start + index]
+
+    def append(self, record):
+        ts = record_time(record)
+        # Keep the time column sorted even if the wall clock steps back
+        if self.times and ts < self.times[-1]:
+            ts = self.times[-1]
+
+        position = self.offset + len(self.records)
+        self.records.append(record)
+        self.times.append(ts)
+        for index, name in self._index_keys(record):
+            index[name].append(position)
+
+        if len(self) > self.maxlen:
+            evicted = self.records[self.start]
+            for index, name in self._index_keys(evicted):
+                # The evicted record is the oldest, so it heads every deque it is in
+                positions = index[name]
+                positions.popleft()
+                if not positions:
+                    del index[name]
+            self.start += 1
+            if self.start > len(self.records) // 2:
+                del self.records[:self.start]
+                del self.times[:self.start]
+                self.offset += self.start
+                self.start = 0
+
+    def _index_keys(self, record):
+        """(index, key) pairs a record is filed under"""
+        keys = [(self.by_clue, clue) for clue in record.get('context_clues', {}).items()]
+        keys.append((self.by_sentiment, sentiment_bucket(record.get('sentiment', 0.0))))
+        return keys
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def first_position(self):
+        return self.offset + self.start
+
+    def since(self, cutoff):
+        """Return records newer than the numeric timestamp `cutoff`."""
+        i = bisect.bisect_right(self.times, cutoff, lo=self.start)
+        return self.records[i:]
+
+    def _lookup(self, positions):
+        return [self.records[p - self.offset] for p in positions]
+
+    def with_clue(self, key, value):
+        """Return records whose context clues set `key` to `value`."""
+        return self._lookup(self.by_clue.get((key, value), deque()))
+
+    def with_sentiment(self, bucket):
+        """Return records in a sentiment bucket: positive, neutral or negative."""
+        return self._lookup(self.by_sentiment.get(bucket, deque()))
+
+    def sentiment_counts(self):
+        return {
+            bucket: len(self.by_sentiment.get(bucket, ()))
+            for bucket in ('positive', 'neutral', 'negative')
+        }
@@ -0,0 +1,184 @@
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+
+
+class MemoryLogStore:
+    """Append-only JSONL log for conversation memory.
+
+    Each interaction is one line. Lines are buffered and group-committed once
+    `batch_size` records are pending or `flush_interval` seconds have passed,
+    so a turn never rewrites the whole history. A crash can only tear the last
+    line, which `load()` cuts off the file. Once the log holds `compact_after`
+    lines, `compact()` rewrites it down to the live window plus a user context
+    snapshot.
+    """
+
+    def __init__(self, path, batch_size=32, flush_interval=1.0, compact_after=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        self.pending = []
+        self.line_count = 0
+        self.compacting = False
+        self.compaction = None
+        self.lock = threading.Lock()
+        _flusher.register(self)
+        # The flusher only holds weak references, so a store dropped without
+        # flush() writes its buffer when collected. `pending` is only ever
+        # cleared in place, so the finalizer sees the live buffer. At exit
+        # the flusher's flush_all runs instead, as it waits for compaction.
+        self.finalizer = weakref.finalize(self, _append_lines, path, self.pending)
+        self.finalizer.atexit = False
+
+    def load(self):
+        """Yield every intact record in the log, oldest first.
+
+        A last line without its newline was torn by a crash; it is truncated
+        away so the next append starts on a fresh line instead of the fragment.
+        """
+        if not os.path.exists(self.path):
+            return
+        intact = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                intact += len(line)
+                self.line_count += 1
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Damaged line from an older crash; skip it, keep the rest
+                    continue
+        if intact < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(intact)
+
+    def append(self, record):
+        with self.lock:
+            self.pending.append(json.dumps(record))
+            if len(self.pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # While a compaction is rewriting the file, keep buffering; the
+        # compaction appends whatever is still pending when it swaps files.
+        if not self.pending or self.compacting:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self.pending) + '\n')
+        except OSError as e:
+            print(f"Error saving memory: {e}")
+            return
+        self.line_count += len(self.pending)
+        self.pending.clear()
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has swapped files."""
+        compaction = self.compaction
+        if compaction is not None:
+            compaction.join()
+
+    def needs_compaction(self):
+        return not self.compacting and self.line_count + len(self.pending) >= self.compact_after
+
+    def compact(self, records, user_context, already_pending=0):
+        """Replace the log with a context snapshot followed by `records`.
+
+        The first `already_pending` buffered lines are covered by `records`;
+        anything buffered after them is carried over into the new file.
+        """
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'user_context': user_context}) + '\n')
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+            with self.lock:
+                carried = self.pending[already_pending:]
+                if carried:
+                    with open(tmp_path, 'a', encoding='utf-8') as f:
+                        f.write('\n'.join(carried) + '\n')
+                os.replace(tmp_path, self.path)
+                self.line_count = len(records) + 1 + len(carried)
+                self.pending.clear()
+                self.compacting = False
+        except OSError as e:
+            print(f"Error compacting memory: {e}")
+            with self.lock:
+                self.compacting = False
+
+    def compact_in_background(self, records, user_context):
+        with self.lock:
+            if self.compacting:
+                return
+            self.compacting = True
+            already_pending = len(self.pending)
+        self.compaction = threading.Thread(
+            target=self.compact, args=(records, user_context, already_pending), daemon=True
+        )
+        self.compaction.start()
+
+
+def _append_lines(path, lines):
+    """Finalizer of a collected store: write what it still had buffered."""
+    if not lines:
+        return
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    except OSError as e:
+        print(f"Error saving memory: {e}")
+    lines.clear()
+
+
+class _BackgroundFlusher:
+    """One daemon thread that group-commits every live store on its interval."""
+
+    def __init__(self, tick=0.25):
+        self.tick = tick
+        self.stores = weakref.WeakSet()
+        self.last_flush = weakref.WeakKeyDictionary()
+        self.thread = None
+        self.lock = threading.Lock()
+        atexit.register(self.flush_all)
+
+    def register(self, store):
+        with self.lock:
+            self.stores.add(store)
+            self.last_flush[store] = time.monotonic()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.tick)
+            now = time.monotonic()
+            with self.lock:
+                due = [s for s in self.stores if now - self.last_flush.get(s, now) >= s.flush_interval]
+                for store in due:
+                    self.last_flush[store] = now
+            for store in due:
+                store.flush()
+
+    def flush_all(self):
+        with self.lock:
+            stores = list(self.stores)
+        for store in stores:
+            # flush() does nothing mid-compaction, so at exit let it finish first
+            store.wait_for_compaction()
+            store.flush()
+
+
+_flusher = _BackgroundFlusher()
@@ -0,0 +1,131 @@
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+import numpy as np
+from textblob import TextBlob
+
+TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+NEGATIONS = {"not", "never", "no", "n't", "isn't", "don't", "doesn't", "didn't", "wasn't", "can't", "won't"}
+
+
+def normalize(text):
+    """Cache key for a message: lowercase with collapsed whitespace."""
+    return " ".join(text.lower().split())
+
+
+class TextBlobSentiment:
+    """Reference backend: TextBlob's pattern analyzer, one message at a time."""
+
+    name = "textblob"
+
+    def polarity_many(self, texts):
+        return [TextBlob(text).sentiment.polarity for text in texts]
+
+
+class LexiconSentiment:
+    """Fast backend scoring whole batches with NumPy.
+
+    Uses the same adjective lexicon TextBlob ships, averaged per word form.
+    A message's polarity is the mean polarity of its lexicon words, with a
+    word flipped and halved when it follows a negation, as TextBlob does.
+    Intensifiers and emoticons are ignored, so scores are close to but not
+    identical with TextBlob's.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, lexicon_path=None):
+        if lexicon_path is None:
+            import textblob
+            lexicon_path = os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+        totals = {}
+        for word in ET.parse(lexicon_path).getroot().iter("word"):
+            form = word.get("form").lower()
+            total, count = totals.get(form, (0.0, 0))
+            totals[form] = (total + float(word.get("polarity")), count + 1)
+
+        # Row 0 is reserved for words outside the lexicon
+        self.word_ids = {}
+        polarities = [0.0]
+        for form, (total, count) in totals.items():
+            if total:
+                self.word_ids[form] = len(polarities)
+                polarities.append(total / count)
+        self.polarities = np.array(polarities)
+
+    def polarity_many(self, texts):
+        ids = []
+        negated = []
+        owners = []
+        for i, text in enumerate(texts):
+            previous = ""
+            for token in TOKEN_RE.findall(text.lower()):
+                word_id = self.word_ids.get(token, 0)
+                if word_id:
+                    ids.append(word_id)
+                    negated.append(previous in NEGATIONS or previous.endswith("n't"))
+                    owners.append(i)
+                previous = token
+        if not ids:
+            return [0.0] * len(texts)
+
+        scores = self.polarities[np.array(ids)]
+        scores = np.where(np.array(negated), scores * -0.5, scores)
+        owners = np.array(owners)
+        sums = np.bincount(owners, weights=scores, minlength=len(texts))
+        counts = np.bincount(owners, minlength=len(texts))
+        means = np.divide(sums, counts, out=np.zeros(len(texts)), where=counts > 0)
+        return np.clip(means, -1.0, 1.0).tolist()
+
+
+BACKENDS = {
+    "textblob": TextBlobSentiment,
+    "lexicon": LexiconSentiment,
+}
+
+
+class SentimentAnalyzer:
+    """Memoized polarity scores over a pluggable backend.
+
+    Scores are cached in an LRU keyed by normalized text, so a message is
+    analyzed at most once however many times it is seen. Batches send only
+    the cache misses to the backend, in one call.
+    """
+
+    def __init__(self, backend="textblob", cache_size=4096):
+        self.backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def polarity(self, text):
+        return self.polarity_many([text])[0]
+
+    def polarity_many(self, texts):
+        keys = [normalize(text) for text in texts]
+        results = {}
+        missing = []
+        with self.lock:
+            for key in keys:
+                if key in results:
+                    continue
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    results[key] = self.cache[key]
+                else:
+                    results[key] = None
+                    missing.append(key)
+
+        if missing:
+            scores = self.backend.polarity_many(missing)
+            with self.lock:
+                for key, score in zip(missing, scores):
+                    results[key] = score
+                    self.cache[key] = score
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        return [results[key] for key in keys]
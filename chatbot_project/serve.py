@@ -0,0 +1,191 @@
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from chatbot_engine import APIIntegrations, ChatbotEngine, ConversationMemory, MLChatbot
+from sentiment import SentimentAnalyzer
+
+# Protocol: one JSON object per line in each direction.
+#   -> {"session": "alice", "message": "hello"}
+#   <- {"session": "alice", "response": "Hi there! ..."}
+# "session" is optional; a connection without one gets its own session.
+
+
+class SessionStore:
+    """Per-session engines sharing one ML model, API client and sentiment cache.
+
+    Opening a session reads its memory log and evicting one flushes it; both
+    touch the disk, so they run on `executor` rather than the event loop.
+    """
+
+    def __init__(self, executor, max_sessions=10000, memory_dir=None, sentiment_backend="textblob"):
+        self.executor = executor
+        self.max_sessions = max_sessions
+        self.memory_dir = memory_dir
+        self.ml_chatbot = MLChatbot()
+        self.api_integrations = APIIntegrations()
+        self.sentiment = SentimentAnalyzer(sentiment_backend)
+        self.sessions = OrderedDict()
+        # Sessions being opened, and evicted sessions whose final flush is running
+        self.opening = {}
+        self.flushing = {}
+        # Turns started (waiting or running) per session; busy sessions are never evicted
+        self.turns = Counter()
+
+    async def get(self, session_id):
+        """Return (engine, lock) for a session, evicting the least recently used idle ones."""
+        if session_id in self.sessions:
+            self.sessions.move_to_end(session_id)
+            return self.sessions[session_id]
+        opening = self.opening.get(session_id)
+        if opening is None:
+            opening = self.opening[session_id] = asyncio.ensure_future(self.open(session_id))
+        # Shielded: one client disconnecting must not cancel the open for the others
+        return await asyncio.shield(opening)
+
+    async def open(self, session_id):
+        loop = asyncio.get_running_loop()
+        try:
+            flushing = self.flushing.get(session_id)
+            if flushing is not None:
+                # Reload only after the evicted engine's last records are on disk
+                await flushing
+            engine = await loop.run_in_executor(self.executor, self.new_engine, session_id)
+            self.sessions[session_id] = (engine, asyncio.Lock())
+        finally:
+            del self.opening[session_id]
+        self.evict()
+        return self.sessions[session_id]
+
+    def new_engine(self, session_id):
+        memory_file = None
+        if self.memory_dir:
+            # Hash the id so client-chosen names cannot escape memory_dir
+            digest = hashlib.sha1(session_id.encode()).hexdigest()
+            memory_file = os.path.join(self.memory_dir, f"{digest}.jsonl")
+        return ChatbotEngine(
+            conversation_memory=ConversationMemory(memory_file=memory_file),
+            api_integrations=self.api_integrations,
+            ml_chatbot=self.ml_chatbot,
+            sentiment=self.sentiment,
+        )
+
+    def evict(self):
+        """Drop the least recently used sessions over max_sessions.
+
+        Sessions with a turn waiting or running are skipped, as their engine
+        would keep writing memory after its final flush; the store may then
+        stay over the limit until they finish. Flushes are not awaited.
+        """
+        excess = len(self.sessions) - self.max_sessions
+        victims = []
+        for session_id, (_, lock) in self.sessions.items():
+            if len(victims) >= excess:
+                break
+            if not lock.locked() and not self.turns[session_id]:
+                victims.append(session_id)
+        loop = asyncio.get_running_loop()
+        for session_id in victims:
+            engine, _ = self.sessions.pop(session_id)
+            flush = loop.run_in_executor(self.executor, engine.conversation_memory.flush)
+            self.flushing[session_id] = flush
+            flush.add_done_callback(lambda f, sid=session_id: self.flush_done(sid, f))
+
+    def flush_done(self, session_id, flush):
+        if self.flushing.get(session_id) is flush:
+            del self.flushing[session_id]
+
+    def start_turn(self, session_id):
+        self.turns[session_id] += 1
+
+    def end_turn(self, session_id):
+        self.turns[session_id] -= 1
+        if not self.turns[session_id]:
+            del self.turns[session_id]
+
+
+class ChatServer:
+    def __init__(self, store, executor):
+        self.store = store
+        self.executor = executor
+        self.connection_ids = itertools.count(1)
+
+    async def respond(self, session_id, message):
+        # Counted from before the session is opened, so it cannot be evicted under us
+        self.store.start_turn(session_id)
+        try:
+            engine, lock = await self.store.get(session_id)
+            # One turn at a time per session; sentiment and HTTP calls block,
+            # so the turn itself runs on the executor.
+            async with lock:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, engine.respond, message)
+        finally:
+            self.store.end_turn(session_id)
+
+    async def handle_client(self, reader, writer):
+        default_session = f"conn-{next(self.connection_ids)}"
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    message = str(request["message"]).strip()
+                    session_id = str(request.get("session") or default_session)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    reply = {"error": "Expected a JSON object with a 'message' field."}
+                else:
+                    response = await self.respond(session_id, message)
+                    reply = {"session": session_id, "response": response}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, workers, max_sessions, memory_dir, sentiment_backend):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        store = SessionStore(executor, max_sessions=max_sessions, memory_dir=memory_dir,
+                             sentiment_backend=sentiment_backend)
+        server = await asyncio.start_server(
+            ChatServer(store, executor).handle_client, host, port, limit=2 ** 20
+        )
+        print(f"CodetechBot server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve CodetechBot over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=32,
+                        help="Threads for blocking work (sentiment, HTTP calls).")
+    parser.add_argument("--max-sessions", type=int, default=10000,
+                        help="Sessions kept in memory before the least recently used is dropped.")
+    parser.add_argument("--memory-dir", default=None,
+                        help="Persist each session's memory here; in-memory only if omitted.")
+    parser.add_argument("--sentiment", choices=["textblob", "lexicon"], default="textblob",
+                        help="Sentiment backend; 'lexicon' is a faster NumPy approximation.")
+    args = parser.parse_args()
+
+    if args.memory_dir:
+        os.makedirs(args.memory_dir, exist_ok=True)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_sessions,
+                          args.memory_dir, args.sentiment))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from api_cache import TTLCache
+from chatbot_engine import APIIntegrations
+
+
+class FakeUpstream(ThreadingHTTPServer):
+    """Weather/news API stand-in on an ephemeral port that counts its calls.
+
+    Replies are taken from `script` (status, body) while it lasts, then a
+    normal weather report or headline list. `delay` slows every reply.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.calls = []
+        self.script = []
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def count(self, path=None):
+        with self.lock:
+            return sum(1 for call in self.calls if path is None or call[0] == path)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        with self.server.lock:
+            self.server.calls.append((url.path, query.get('q') or query.get('category')))
+            scripted = self.server.script.pop(0) if self.server.script else None
+        time.sleep(self.server.delay)
+        if scripted is not None:
+            status, body = scripted
+        elif url.path == '/weather':
+            status, body = 200, json.dumps({
+                'main': {'temp': 21.5, 'humidity': 40},
+                'weather': [{'description': f"clear sky over {query['q']}"}],
+            })
+        else:
+            status, body = 200, json.dumps({'articles': [{'title': f"{query['category']} story {i}"}
+                                                          for i in range(3)]})
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def upstream():
+    server = FakeUpstream()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(upstream):
+    api = APIIntegrations(timeout=5, cache_size=2)
+    api.weather_api_key = 'test-key'
+    api.news_api_key = 'test-key'
+    api.WEATHER_URL = upstream.url('/weather')
+    api.NEWS_URL = upstream.url('/news')
+    return api
+
+
+def use_clock(api, name, ttl):
+    clock = FakeClock()
+    api.caches[name] = TTLCache(ttl, api.caches[name].max_size, clock=clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(api, upstream):
+    clock = use_clock(api, 'weather', ttl=600)
+    first = api.get_weather('paris')
+    assert 'clear sky over paris' in first.lower()
+    clock.now += 599
+    assert api.get_weather('paris') == first
+    assert upstream.count() == 1
+    clock.now += 2
+    assert api.get_weather('paris') == first
+    assert upstream.count() == 2
+
+
+def test_least_recently_used_entry_is_evicted(api, upstream):
+    for city in ['paris', 'oslo', 'paris', 'rome']:
+        api.get_weather(city)
+    # 'paris' was used after 'oslo', so the third city pushes out 'oslo'
+    assert [call[1] for call in upstream.calls] == ['paris', 'oslo', 'rome']
+    api.get_weather('paris')
+    api.get_weather('rome')
+    assert upstream.count() == 3
+    api.get_weather('oslo')
+    assert [call[1] for call in upstream.calls] == ['paris', 'oslo', 'rome', 'oslo']
+    assert api.cache_stats()['weather']['size'] == 2
+
+
+def test_concurrent_identical_lookups_call_upstream_once(api, upstream):
+    upstream.delay = 0.3
+    workers = 16
+    barrier = threading.Barrier(workers)
+    replies = []
+
+    def lookup():
+        barrier.wait()
+        replies.append(api.get_news_headlines('science'))
+
+    threads = [threading.Thread(target=lookup) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert upstream.count('/news') == 1
+    assert len(replies) == workers and len(set(replies)) == 1
+    assert 'science story 0' in replies[0]
+    stats = api.cache_stats()['news']
+    assert stats['misses'] == 1 and stats['hits'] + stats['coalesced'] == workers - 1
+
+
+@pytest.mark.parametrize('status, body', [
+    (500, json.dumps({'message': 'internal error'})),
+    (502, '<html><body>Bad Gateway</body></html>'),
+    (200, '<html><body>Maintenance</body></html>'),
+    (401, json.dumps({'cod': 401, 'message': 'Invalid API key'})),
+])
+def test_failed_weather_call_is_retried_not_cached(api, upstream, status, body):
+    upstream.script = [(status, body)]
+    assert api.get_weather('paris') == "⚠️ Weather service is currently unavailable."
+    assert api.cache_stats()['weather']['size'] == 0
+    assert 'clear sky over paris' in api.get_weather('paris').lower()
+    assert upstream.count() == 2
+
+
+def test_failed_news_call_is_retried_not_cached(api, upstream):
+    upstream.script = [(503, '<html>Service Unavailable</html>')]
+    assert api.get_news_headlines('science') == "⚠️ News service is currently unavailable."
+    assert 'science story 0' in api.get_news_headlines('science')
+    assert upstream.count('/news') == 2
+
+
+def test_unknown_city_is_cached(api, upstream):
+    upstream.script = [(404, json.dumps({'cod': '404', 'message': 'city not found'}))]
+    reply = api.get_weather('atlantis')
+    assert 'check the city name' in reply
+    assert api.get_weather('atlantis') == reply
+    assert upstream.count() == 1
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module):
+    """Cumulative import time (ms) of `module` and of each import it makes directly.
+
+    Parsed from `python -X importtime`, in a fresh interpreter.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    total, direct, children = 0.0, {}, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Each nesting level indents the name by two more spaces, and a
+        # module's line comes after those of everything it imported
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children[name.strip()] = int(cumulative) / 1000
+        elif depth == 0:
+            if name.strip() == module:
+                total, direct = int(cumulative) / 1000, children
+            children = {}
+    return total, direct
+
+
+def cold_run(args, repeat):
+    """Median wall time (ms) of a fresh `python predict.py ...` process"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "predict.py"] + args, cwd=HERE, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure predict.py import time and cold start.")
+    parser.add_argument("--repeat", type=int, default=5, help="Cold runs per model; the median is reported.")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest direct imports to list.")
+    parser.add_argument("--history", default=None,
+                        help="JSON lines file to append this run to, to track startup over time.")
+    args = parser.parse_args()
+
+    total, direct = import_times("predict")
+    print(f"import predict: {total:.1f} ms")
+    for name, ms in sorted(direct.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<28} {ms:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = os.path.join(tmp, "sample.npy")
+        np.save(sample, np.array([[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3]]))
+        output = os.path.join(tmp, "out.csv")
+        runs = {}
+        for model in ("iris_model.npz", "iris_model.joblib"):
+            if model.endswith(".joblib") and not os.path.exists(os.path.join(HERE, "model_metadata.joblib")):
+                print(f"skipping {model}: model_metadata.joblib not found (run train_model.py)")
+                continue
+            runs[model] = cold_run(["--model", model, "--input", sample, "--output", output], args.repeat)
+            print(f"cold start, 2 rows from .npy with {model}: {runs[model]:.0f} ms")
+
+    if args.history:
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "import_predict_ms": round(total, 1),
+            "imports_ms": {name: round(ms, 1) for name, ms in direct.items() if ms >= 1},
+            "cold_start_ms": {model: round(ms) for model, ms in runs.items()},
+        }
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import os
+import resource
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Chunks held back to gather every class before a forest shard is fitted anyway
+MAX_PENDING_CHUNKS = 8
+
+
+class ChunkLoader:
+    """Streams (X, y) chunks of a table on disk; only one chunk is in memory at a time.
+
+    Subclasses provide `columns()` and `frames(columns)`; chunks come out
+    in the same order on every pass, so chunk indices are stable.
+    """
+
+    def __init__(self, path, target, features=None, chunk_rows=100_000):
+        self.path = path
+        self.target = target
+        self.chunk_rows = chunk_rows
+        columns = self.columns()
+        if target not in columns:
+            raise ValueError(f"Target column '{target}' not in {path}")
+        self.features = list(features) if features else [name for name in columns if name != target]
+
+    def columns(self):
+        raise NotImplementedError
+
+    def frames(self, columns):
+        raise NotImplementedError
+
+    def targets(self):
+        """Only the target column, chunk by chunk"""
+        for frame in self.frames([self.target]):
+            yield frame[self.target].to_numpy()
+
+    def __iter__(self):
+        for frame in self.frames(self.features + [self.target]):
+            yield frame[self.features].to_numpy(np.float32), frame[self.target].to_numpy()
+
+
+class CsvLoader(ChunkLoader):
+    def columns(self):
+        return list(pd.read_csv(self.path, nrows=0).columns)
+
+    def frames(self, columns):
+        yield from pd.read_csv(self.path, usecols=columns, chunksize=self.chunk_rows)
+
+
+class ParquetLoader(ChunkLoader):
+    """Reads record batches with pyarrow, which is only needed for Parquet input"""
+
+    def _file(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet needs pyarrow: pip install pyarrow") from None
+        return pq.ParquetFile(self.path)
+
+    def columns(self):
+        return list(self._file().schema_arrow.names)
+
+    def frames(self, columns):
+        for batch in self._file().iter_batches(batch_size=self.chunk_rows, columns=columns):
+            yield batch.to_pandas()
+
+
+LOADERS = {'.csv': CsvLoader, '.parquet': ParquetLoader, '.pq': ParquetLoader}
+
+
+def open_loader(path, target, features=None, chunk_rows=100_000):
+    """Loader for a .csv or .parquet file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in LOADERS:
+        raise ValueError(f"Unsupported training data format: {ext or path}")
+    return LOADERS[ext](path, target, features, chunk_rows)
+
+
+def reset_peak_rss():
+    """Restart the kernel's RSS high-water mark, where Linux allows it"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """Peak resident set size in bytes since the last reset (or process start)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS; it cannot be reset
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PassMeter:
+    """Rows, wall time, throughput and peak RSS of each pass over the data"""
+
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+        self.passes = []
+        self.current = None
+
+    def start(self, name):
+        reset_peak_rss()
+        self.current = {'pass': name, 'rows': 0, 'start': time.perf_counter()}
+        return self.current
+
+    def finish(self):
+        stats = self.current
+        stats['seconds'] = time.perf_counter() - stats.pop('start')
+        stats['rows_per_s'] = stats['rows'] / max(stats['seconds'], 1e-9)
+        stats['peak_rss_mb'] = peak_rss() / 2 ** 20
+        self.passes.append(stats)
+        if self.verbose:
+            print(f"  {stats['pass']:<10} {stats['rows']:>12,} rows {stats['seconds']:8.1f}s "
+                  f"{stats['rows_per_s']:>12,.0f} rows/s  peak RSS {stats['peak_rss_mb']:7.0f} MB")
+        return stats
+
+
+def is_holdout(index, holdout_every):
+    """Every holdout_every-th chunk is kept for evaluation instead of training"""
+    return holdout_every > 0 and index % holdout_every == holdout_every - 1
+
+
+def encode(y, classes):
+    """Class labels as indices into the sorted `classes`"""
+    index = np.searchsorted(classes, y)
+    if (index >= len(classes)).any() or (classes[np.minimum(index, len(classes) - 1)] != y).any():
+        raise ValueError(f"Labels outside the known classes: {np.setdiff1d(y, classes)[:5]}")
+    return index
+
+
+def scan_classes(loader, meter):
+    """Sorted class labels found in the target column, from one pass reading only that column"""
+    stats = meter.start('scan')
+    classes = None
+    for y in loader.targets():
+        labels = np.unique(y)
+        classes = labels if classes is None else np.union1d(classes, labels)
+        stats['rows'] += len(y)
+    meter.finish()
+    if classes is None:
+        raise ValueError(f"No rows in {loader.path}")
+    return classes
+
+
+def merge_forests(shards, feature_names=None):
+    """One RandomForestClassifier holding the trees of every shard"""
+    forest = shards[0]
+    forest.estimators_ = [tree for shard in shards for tree in shard.estimators_]
+    forest.n_estimators = len(forest.estimators_)
+    forest.n_jobs = None
+    if feature_names is not None:
+        forest.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    return forest
+
+
+def train_forest(loader, classes, meter, trees_per_shard=10, max_depth=3,
+                 holdout_every=0, n_jobs=None, seed=42):
+    """Fit a small forest per chunk and merge them into one.
+
+    Every shard needs all classes in its `classes_`, or its trees'
+    probability columns would not line up. Chunks missing a class wait and
+    are fitted together with the next ones. After MAX_PENDING_CHUNKS the
+    batch is fitted anyway, as on class-sorted input. Each missing class
+    then gets one zero-weight copy of an existing row: it is listed in
+    `classes_` with probability 0 everywhere but carries no weight in the
+    splits.
+    The last batch is held back so leftovers at the end join it.
+    """
+    shards, ready, pending = [], None, []
+
+    def fit(batch):
+        X = np.concatenate([X for X, _ in batch])
+        y = np.concatenate([y for _, y in batch])
+        weight = np.ones(len(y))
+        missing = np.setdiff1d(np.arange(len(classes)), y)
+        if len(missing):
+            X = np.concatenate([X, np.repeat(X[:1], len(missing), axis=0)])
+            y = np.concatenate([y, missing])
+            weight = np.concatenate([weight, np.zeros(len(missing))])
+        shard = RandomForestClassifier(n_estimators=trees_per_shard, max_depth=max_depth,
+                                       n_jobs=n_jobs, random_state=seed + len(shards))
+        shards.append(shard.fit(X, y, sample_weight=weight))
+
+    stats = meter.start('train')
+    for index, (X, y) in enumerate(loader):
+        if is_holdout(index, holdout_every):
+            continue
+        stats['rows'] += len(X)
+        pending.append((X, encode(y, classes)))
+        seen = np.unique(np.concatenate([y for _, y in pending]))
+        if len(seen) == len(classes) or len(pending) >= MAX_PENDING_CHUNKS:
+            if ready:
+                fit(ready)
+            ready, pending = pending, []
+    if not ready and not pending:
+        raise ValueError("Every chunk was held out; nothing to train on")
+    fit((ready or []) + pending)
+    stats['shards'] = len(shards)
+    meter.finish()
+    return merge_forests(shards, loader.features)
+
+
+def train_sgd(loader, classes, meter, epochs=5, holdout_every=0, seed=42):
+    """Logistic regression by SGDClassifier.partial_fit, a chunk at a time, for several epochs.
+
+    A first pass fits the StandardScaler incrementally; rows are shuffled
+    within each chunk, as SGD on class-sorted data converges badly.
+    """
+    scaler = StandardScaler()
+    stats = meter.start('scale')
+    for index, (X, _) in enumerate(loader):
+        if not is_holdout(index, holdout_every):
+            scaler.partial_fit(X)
+            stats['rows'] += len(X)
+    meter.finish()
+
+    rng = np.random.default_rng(seed)
+    model = SGDClassifier(loss='log_loss', random_state=seed)
+    labels = np.arange(len(classes))
+    for epoch in range(1, epochs + 1):
+        stats = meter.start(f'epoch {epoch}')
+        for index, (X, y) in enumerate(loader):
+            if is_holdout(index, holdout_every):
+                continue
+            order = rng.permutation(len(X))
+            model.partial_fit(scaler.transform(X[order]), encode(y, classes)[order], classes=labels)
+            stats['rows'] += len(X)
+        meter.finish()
+    # Like the forest, accept DataFrames with these columns without a warning
+    scaler.feature_names_in_ = np.asarray(loader.features, dtype=object)
+    return make_pipeline(scaler, model)
+
+
+def evaluate(model, loader, classes, meter, holdout_every):
+    """Accuracy on the held-out chunks, or None if nothing was held out"""
+    if holdout_every <= 0:
+        return None
+    stats = meter.start('evaluate')
+    correct = 0
+    for index, (X, y) in enumerate(loader):
+        if is_holdout(index, holdout_every):
+            with warnings.catch_warnings():
+                # Fitted with feature names; the arrays are in the same column order
+                warnings.filterwarnings('ignore', message='X does not have valid feature names')
+                predictions = model.predict(X)
+            correct += int((predictions == encode(y, classes)).sum())
+            stats['rows'] += len(X)
+    meter.finish()
+    return correct / stats['rows'] if stats['rows'] else None
@@ -0,0 +1,242 @@
+import argparse
+import io
+import struct
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+# Rows walked through the forest at once; bounds the (trees x rows) node matrix
+BLOCK_ROWS = 16384
+# Member data alignment in saved .npz files, so memory-mapped arrays are aligned
+ALIGN = 64
+
+
+def export_forest(model, path, feature_names, target_names):
+    """Flatten a fitted RandomForestClassifier into a few arrays in an .npz file.
+
+    All trees share one node table: split feature and threshold, the
+    (left, right) children and the class probabilities of each node,
+    exactly as DecisionTreeClassifier.predict_proba returns them. Leaves
+    have an infinite threshold and point back at themselves, so a walk
+    can keep stepping once it reaches them. `roots` holds each tree's
+    first node.
+    """
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        leaf = tree.children_left == -1
+        nodes = np.arange(tree.node_count) + offset
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        # sklearn >= 1.4 already stores fractions and returns them as they are
+        if np.allclose(normalizer, 1.0):
+            normalizer = np.ones_like(normalizer)
+        normalizer[normalizer == 0.0] = 1.0
+        roots.append(offset)
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold))
+        children.append(np.column_stack([
+            np.where(leaf, nodes, tree.children_left + offset),
+            np.where(leaf, nodes, tree.children_right + offset),
+        ]))
+        values.append(value / normalizer)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    save_arrays(path, dict(
+        feature=np.concatenate(features).astype(np.int64),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        children=np.concatenate(children).astype(np.int64),
+        value=np.concatenate(values),
+        roots=np.array(roots, dtype=np.int64),
+        max_depth=depth,
+        classes=model.classes_,
+        feature_names=np.array(feature_names),
+        target_names=np.array(target_names),
+    ))
+
+
+def save_arrays(path, arrays):
+    """Like np.savez, but every member's data starts on an ALIGN-byte boundary.
+
+    The padding goes in the zip extra field of each member's local header
+    (the zipalign record), so np.load reads the file as usual. Timestamps
+    are fixed, so the same arrays always give the same bytes.
+    """
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as archive:
+        for name, value in arrays.items():
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, np.asanyarray(value), allow_pickle=False)
+            info = zipfile.ZipInfo(name + '.npy', date_time=(1980, 1, 1, 0, 0, 0))
+            data_start = archive.fp.tell() + 30 + len(info.filename.encode()) + 6
+            padding = -data_start % ALIGN
+            info.extra = struct.pack('<HHH', 0xD935, 2 + padding, ALIGN) + bytes(padding)
+            archive.writestr(info, buffer.getvalue())
+
+
+def load_arrays(path, mmap_mode=None):
+    """All arrays of an .npz file by name.
+
+    With `mmap_mode` ('r', 'c', ...) uncompressed members are memory-mapped
+    from the file rather than read, so loading costs a few header reads
+    whatever the model size. Members that are not aligned (e.g. from
+    np.savez) are copied, as gathers from unaligned memory are much slower.
+    """
+    if mmap_mode is None:
+        with np.load(path) as saved:
+            return {name: saved[name] for name in saved.files}
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+            # Member data follows the 30-byte local header, file name and extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject or not shape or 0 in shape or f.tell() % dtype.alignment:
+                f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+                arrays[name] = np.lib.format.read_array(f)
+            else:
+                mapped = np.memmap(path, dtype=dtype, mode=mmap_mode, offset=f.tell(),
+                                   shape=shape, order='F' if fortran_order else 'C')
+                # A plain view: indexing a memmap subclass re-wraps every result
+                arrays[name] = mapped.view(np.ndarray)
+    return arrays
+
+
+class CompactForest:
+    """Pure-NumPy predictor for a forest written by export_forest.
+
+    All trees walk the whole batch at once: the current nodes form a
+    (trees, rows) matrix and each step gathers their split feature,
+    threshold and child with fancy indexing, so a batch costs max_depth
+    vectorised steps however many trees there are.
+    """
+
+    def __init__(self, arrays):
+        # astype is a no-op for current exports, so memory-mapped arrays stay mapped
+        self.feature = arrays["feature"].astype(np.intp, copy=False)
+        self.threshold = arrays["threshold"]
+        # Interleaved (left, right) pairs: the child of node i is children[2 * i + went_right]
+        self.children = arrays["children"].astype(np.intp, copy=False).reshape(-1)
+        self.value = arrays["value"]
+        self.roots = arrays["roots"].astype(np.intp, copy=False)
+        self.max_depth = int(arrays["max_depth"])
+        self.classes_ = arrays["classes"]
+        self.feature_names = arrays["feature_names"].tolist()
+        self.target_names = arrays["target_names"].tolist()
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        return cls(load_arrays(path, mmap_mode))
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (trees, rows)"""
+        # Trees compare float32 inputs with float64 thresholds, as sklearn does
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32).T)
+        rows = np.arange(X.shape[1])
+        node = np.repeat(self.roots[:, None], X.shape[1], axis=1)
+        for _ in range(self.max_depth):
+            went_right = X[self.feature[node], rows] > self.threshold[node]
+            node = self.children[2 * node + went_right]
+        return node
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        proba = np.empty((len(X), len(self.classes_)))
+        for start in range(0, len(X), BLOCK_ROWS):
+            leaves = self.apply(X[start:start + BLOCK_ROWS])
+            # Summed over trees in tree order, then divided, as sklearn does
+            proba[start:start + BLOCK_ROWS] = self.value[leaves].sum(axis=0) / len(leaves)
+        return proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def check_parity(model_path, compact_path, samples=100_000, seed=0):
+    """Compare CompactForest with the sklearn model it was exported from"""
+    import joblib
+    from sklearn.datasets import load_iris
+
+    model = joblib.load(model_path)
+    forest = CompactForest.load(compact_path)
+    rng = np.random.default_rng(seed)
+    iris = load_iris().data
+    random_rows = rng.uniform(iris.min(axis=0) - 1, iris.max(axis=0) + 1, size=(samples, iris.shape[1]))
+    # Rows sitting exactly on split thresholds exercise the <= boundary
+    split_nodes = np.flatnonzero(np.isfinite(forest.threshold))
+    on_threshold = random_rows[:len(split_nodes)].copy()
+    on_threshold[np.arange(len(split_nodes)), forest.feature[split_nodes]] = forest.threshold[split_nodes]
+    X = np.vstack([iris, random_rows, on_threshold]).astype(np.float32)
+
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    max_diff = float(np.abs(expected - actual).max())
+    labels_match = bool((model.predict(X) == forest.predict(X)).all())
+    print(f"{len(X)} rows: max |proba diff| {max_diff:.3g}, labels identical: {labels_match}")
+    return labels_match and max_diff < 1e-12
+
+
+def benchmark(model_path, compact_path, repeat=200):
+    """Load time and single-row / batch latency, sklearn vs CompactForest"""
+    start = time.perf_counter()
+    import joblib
+    model = joblib.load(model_path)
+    sklearn_load = time.perf_counter() - start
+    start = time.perf_counter()
+    forest = CompactForest.load(compact_path)
+    compact_load = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    row = rng.uniform(1, 7, size=(1, 4)).astype(np.float32)
+    batch = rng.uniform(1, 7, size=(100_000, 4)).astype(np.float32)
+    results = []
+    for name, predict_proba in (("sklearn", model.predict_proba), ("compact", forest.predict_proba)):
+        predict_proba(row)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            predict_proba(row)
+        single = (time.perf_counter() - start) / repeat
+        start = time.perf_counter()
+        predict_proba(batch)
+        results.append((name, single, time.perf_counter() - start))
+    print(f"load (incl. imports): sklearn {sklearn_load * 1000:.1f} ms, compact {compact_load * 1000:.1f} ms")
+    for name, single, batched in results:
+        print(f"{name:>8}: 1 row {single * 1e6:9.1f} us, 100k rows {batched * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, check and benchmark the compact forest.")
+    parser.add_argument("command", choices=["export", "check", "benchmark"])
+    parser.add_argument("--model", default="iris_model.joblib")
+    parser.add_argument("--output", default="iris_model.npz")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        import joblib
+        from sklearn.datasets import load_iris
+
+        iris = load_iris()
+        export_forest(joblib.load(args.model), args.output, iris.feature_names, iris.target_names)
+        print(f"Compact model saved as '{args.output}'")
+    elif args.command == "check":
+        sys.exit(0 if check_parity(args.model, args.output) else 1)
+    else:
+        benchmark(args.model, args.output)
+
+
+if __name__ == "__main__":
+    main()
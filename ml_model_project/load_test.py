@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Typical Iris measurement ranges, used to draw random request rows
+LOW = np.array([4.3, 2.0, 1.0, 0.1])
+HIGH = np.array([7.9, 4.4, 6.9, 2.5])
+
+
+async def http_request(reader, writer, method, path, body=b""):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, rows, latencies):
+    """One keep-alive connection sending its rows one request at a time."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for row in rows:
+            body = json.dumps({"features": row}).encode()
+            start = time.perf_counter()
+            status, _ = await http_request(reader, writer, "POST", "/predict", body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Server returned {status}")
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, requests, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = rng.uniform(LOW, HIGH, size=(requests, 4)).round(1).tolist()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, rows[i::concurrency], latencies) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_stats = await http_request(reader, writer, "GET", "/stats")
+    writer.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"{requests} requests, {concurrency} concurrent connections, {elapsed:.2f}s")
+    print(f"client: throughput {requests / elapsed:,.0f} req/s, "
+          f"p50 {np.percentile(latencies_ms, 50):.2f} ms, p99 {np.percentile(latencies_ms, 99):.2f} ms")
+    print(f"server: {json.dumps(server_stats)}")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port, serve_args):
+    """Start serve.py on `port` and wait until it accepts connections."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(here, "serve.py"), "--port", str(port)] + serve_args)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("serve.py exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("serve.py did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the Iris model server. Without --port, starts its own serve.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port of a running server.")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("serve_args", nargs=argparse.REMAINDER,
+                        help="Extra serve.py options after '--', e.g. -- --window-ms 0 --max-batch 1")
+    args = parser.parse_args()
+    serve_args = [arg for arg in args.serve_args if arg != "--"]
+
+    process = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        process = spawn_server(port, serve_args)
+    try:
+        asyncio.run(run_load(args.host, port, args.concurrency, args.requests))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
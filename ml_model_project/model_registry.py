@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Layout of a registry directory:
+#   artifacts/<sha256>/      model files, named by a hash of their names and bytes; never modified
+#   versions/<number>.json   one record per published version: digest, files, time, note
+#   CURRENT                  digest of the version predictors should serve, replaced atomically
+
+MODEL_FILES = ('iris_model.npz', 'iris_model.joblib', 'model_metadata.joblib')
+
+
+def content_digest(paths):
+    """SHA-256 over the base names and bytes of the files, in name order"""
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=os.path.basename):
+        digest.update(os.path.basename(path).encode() + b'\0')
+        digest.update(str(os.path.getsize(path)).encode() + b'\0')
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def write_atomic(path, text):
+    """Replace `path` so readers see either the old or the new content, never a mix"""
+    folder = os.path.dirname(path) or '.'
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ModelRegistry:
+    """Versioned, content-addressed model artifacts in a local directory"""
+
+    def __init__(self, root):
+        self.root = root
+        self.artifacts = os.path.join(root, 'artifacts')
+        self.version_dir = os.path.join(root, 'versions')
+        self.pointer = os.path.join(root, 'CURRENT')
+
+    def versions(self):
+        """All version records, oldest first"""
+        if not os.path.isdir(self.version_dir):
+            return []
+        records = []
+        for name in sorted(os.listdir(self.version_dir)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.version_dir, name)) as f:
+                    records.append(json.load(f))
+        return records
+
+    def publish(self, paths, note='', accuracy=None):
+        """Copy model files in as a new version, or return the version that already has them"""
+        if not paths:
+            raise ValueError("No model files to publish")
+        digest = content_digest(paths)
+        for record in self.versions():
+            if record['digest'] == digest:
+                return record
+
+        target = os.path.join(self.artifacts, digest)
+        if not os.path.isdir(target):
+            os.makedirs(self.artifacts, exist_ok=True)
+            staging = tempfile.mkdtemp(dir=self.artifacts, prefix='.tmp-')
+            for path in paths:
+                shutil.copyfile(path, os.path.join(staging, os.path.basename(path)))
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Published concurrently with the same content
+                shutil.rmtree(staging)
+
+        os.makedirs(self.version_dir, exist_ok=True)
+        number = len(self.versions()) + 1
+        while True:
+            record = {
+                'version': number,
+                'digest': digest,
+                'files': sorted(os.path.basename(path) for path in paths),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'accuracy': accuracy,
+                'note': note,
+            }
+            fd, tmp = tempfile.mkstemp(dir=self.version_dir, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(record, f, indent=2)
+            try:
+                # link() fails if the number is taken, so two publishers never share one
+                os.link(tmp, os.path.join(self.version_dir, f'{number:06d}.json'))
+                return record
+            except FileExistsError:
+                number += 1
+            finally:
+                os.unlink(tmp)
+
+    def resolve(self, version):
+        """Version record for a number, 'v'-prefixed number, digest prefix or 'current'"""
+        if version == 'current':
+            digest = self.current_digest()
+            if digest is None:
+                raise FileNotFoundError(f"No current model in registry '{self.root}'")
+            version = digest
+        version = str(version)
+        records = self.versions()
+        for record in records:
+            if version.lstrip('v') == str(record['version']):
+                return record
+        for record in records:
+            if len(version) >= 6 and record['digest'].startswith(version):
+                return record
+        raise KeyError(f"No version '{version}' in registry '{self.root}'")
+
+    def promote(self, version):
+        """Point CURRENT at a version; predictors watching the registry pick it up"""
+        record = self.resolve(version)
+        write_atomic(self.pointer, record['digest'] + '\n')
+        return record
+
+    def current_digest(self):
+        try:
+            with open(self.pointer) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current(self):
+        return self.resolve('current')
+
+    def path(self, record, name):
+        """Path of one of a version's files"""
+        return os.path.join(self.artifacts, record['digest'], name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model registry.")
+    parser.add_argument('--registry', default='models', help="Registry directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    publish = commands.add_parser('publish', help="Add model files as a new version")
+    publish.add_argument('files', nargs='*', help=f"Default: whichever of {', '.join(MODEL_FILES)} exist")
+    publish.add_argument('--note', default='')
+    publish.add_argument('--promote', action='store_true', help="Also make it the current version")
+    promote = commands.add_parser('promote', help="Make a version current (also used to roll back)")
+    promote.add_argument('version')
+    commands.add_parser('list', help="Show all versions; * marks the current one")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    try:
+        if args.command == 'publish':
+            files = args.files or [name for name in MODEL_FILES if os.path.exists(name)]
+            record = registry.publish(files, args.note)
+            print(f"Published version {record['version']} ({record['digest'][:12]})")
+            if args.promote:
+                registry.promote(record['version'])
+                print(f"Version {record['version']} is now current")
+        elif args.command == 'promote':
+            record = registry.promote(args.version)
+            print(f"Version {record['version']} ({record['digest'][:12]}) is now current")
+        else:
+            current = registry.current_digest()
+            for record in registry.versions():
+                marker = '*' if record['digest'] == current else ' '
+                accuracy = '' if record['accuracy'] is None else f"acc {record['accuracy']:.4f}  "
+                print(f"{marker} v{record['version']:<4} {record['digest'][:12]}  {record['created']}  "
+                      f"{accuracy}{', '.join(record['files'])}  {record['note']}")
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+# Searched when no --params file is given
+DEFAULT_SPACE = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [2, 3, 4, None],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', None],
+}
+
+
+def candidates(space, strategy='grid', n_iter=20, seed=42):
+    """Parameter dicts to try: every grid combination, or n_iter random draws"""
+    if strategy == 'grid':
+        return list(ParameterGrid(space))
+    if strategy == 'random':
+        return list(ParameterSampler(space, n_iter=n_iter, random_state=seed))
+    raise ValueError(f"Unknown search strategy: {strategy}")
+
+
+def fit_fold(X, y, train, test, params, seed, deadline):
+    """Fit and score one candidate on one fold, unless the time budget is spent"""
+    if deadline is not None and time.time() > deadline:
+        return None
+    model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+    start = time.perf_counter()
+    model.fit(X[train], y[train])
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    score = float((model.predict(X[test]) == y[test]).mean())
+    return {
+        'fit_time': fit_time,
+        'score_time': time.perf_counter() - start,
+        'score': score,
+        'worker': os.getpid(),
+    }
+
+
+def run_search(X, y, space=None, strategy='grid', n_iter=20, cv=5, n_jobs=-1,
+               time_budget=None, seed=42, verbose=True):
+    """Cross-validated search over RandomForestClassifier parameters.
+
+    Each (candidate, fold) fit is a separate task for joblib's process
+    pool. X and y are dumped once to a temporary folder and memory-mapped,
+    so workers share the same pages instead of receiving copies. Tasks
+    that start after `time_budget` seconds are skipped, except those of the
+    first candidate, so there is always a result; candidates with missing
+    folds are reported but cannot win. Returns the report dict.
+    """
+    params_list = candidates(space or DEFAULT_SPACE, strategy, n_iter, seed)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed).split(X, y))
+    start = time.time()
+    deadline = start + time_budget if time_budget else None
+
+    with tempfile.TemporaryDirectory() as folder:
+        X_path, y_path = os.path.join(folder, 'X.joblib'), os.path.join(folder, 'y.joblib')
+        joblib.dump(np.ascontiguousarray(X), X_path)
+        joblib.dump(np.asarray(y), y_path)
+        X_shared = joblib.load(X_path, mmap_mode='r')
+        y_shared = joblib.load(y_path, mmap_mode='r')
+
+        tasks = [(c, f) for c in range(len(params_list)) for f in range(cv)]
+        results = Parallel(n_jobs=n_jobs, return_as='generator')(
+            delayed(fit_fold)(X_shared, y_shared, folds[f][0], folds[f][1], params_list[c], seed,
+                              deadline if c else None)
+            for c, f in tasks
+        )
+        fits = []
+        for (c, f), result in zip(tasks, results):
+            if result is not None:
+                fits.append(dict(candidate=c, fold=f, **result))
+                if verbose and f == cv - 1:
+                    print(f"  [{time.time() - start:6.1f}s] candidate {c + 1}/{len(params_list)} done")
+        del X_shared, y_shared
+
+    rows = []
+    for c, params in enumerate(params_list):
+        scores = [fit['score'] for fit in fits if fit['candidate'] == c]
+        times = [fit['fit_time'] for fit in fits if fit['candidate'] == c]
+        rows.append({
+            'params': params,
+            'folds': len(scores),
+            'mean_score': float(np.mean(scores)) if scores else None,
+            'std_score': float(np.std(scores)) if scores else None,
+            'mean_fit_time': float(np.mean(times)) if times else None,
+        })
+    complete = [row for row in rows if row['folds'] == cv]
+    # Highest mean score wins; ties go to the faster fit
+    complete.sort(key=lambda row: (-row['mean_score'], row['mean_fit_time']))
+    for rank, row in enumerate(complete, 1):
+        row['rank'] = rank
+
+    elapsed = time.time() - start
+    return {
+        'strategy': strategy,
+        'cv': cv,
+        'n_jobs': n_jobs,
+        'workers': len({fit['worker'] for fit in fits}),
+        'time_budget': time_budget,
+        'elapsed': elapsed,
+        'budget_exhausted': len(fits) < len(tasks),
+        'fits_done': len(fits),
+        'fits_planned': len(tasks),
+        'total_fit_time': float(sum(fit['fit_time'] for fit in fits)),
+        'best_params': complete[0]['params'] if complete else None,
+        'best_score': complete[0]['mean_score'] if complete else None,
+        'candidates': rows,
+        'fits': fits,
+    }
+
+
+def print_report(report, top=5):
+    print(f"\n{report['fits_done']}/{report['fits_planned']} fits on {report['workers']} worker(s) "
+          f"in {report['elapsed']:.1f}s ({report['total_fit_time']:.1f}s of fitting)"
+          + (" - time budget reached" if report['budget_exhausted'] else ""))
+    ranked = sorted((row for row in report['candidates'] if 'rank' in row), key=lambda row: row['rank'])
+    for row in ranked[:top]:
+        print(f"  #{row['rank']:<3} {row['mean_score']:.4f} ± {row['std_score']:.4f}  "
+              f"fit {row['mean_fit_time'] * 1000:7.1f} ms  {row['params']}")
+
+
+def save_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
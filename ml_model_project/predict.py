@@ -1,38 +1,126 @@
-import joblib
-import pandas as pd
+import argparse
 import numpy as np
 import sys
 import os
+import threading
+import time
+import warnings
+
+from compact_forest import CompactForest
+
+# pandas, joblib and sklearn are imported where first needed: scoring an
+# .npy file or serving with the .npz model never loads them at all.
+
+INPUT_FORMATS = ('csv', 'jsonl', 'npy')
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+def read_model(model_path, metadata_path):
+    """(model, feature_names, target_names) from a compact .npz, or a .joblib model and its metadata"""
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file '{model_path}' not found. Please train the model first.")
+    
+    if model_path.endswith('.npz'):
+        # The compact export carries its own feature and class names, and
+        # is memory-mapped rather than read
+        model = CompactForest.load(model_path, mmap_mode='r')
+        return model, model.feature_names, model.target_names
+    
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"Metadata file '{metadata_path}' not found.")
+    
+    import joblib
+    metadata = joblib.load(metadata_path)
+    return joblib.load(model_path), metadata['feature_names'], metadata['target_names']
+
+def read_version(registry, record):
+    """read_model for a registry version, preferring its compact .npz"""
+    if 'iris_model.npz' in record['files']:
+        return read_model(registry.path(record, 'iris_model.npz'), None)
+    return read_model(registry.path(record, 'iris_model.joblib'),
+                      registry.path(record, 'model_metadata.joblib'))
 
 class IrisPredictor:
-    def __init__(self, model_path='iris_model.joblib', metadata_path='model_metadata.joblib'):
+    def __init__(self, model_path='iris_model.npz', metadata_path='model_metadata.joblib', verbose=True):
         self.model = None
         self.feature_names = None
         self.target_names = None
+        self.registry = None
+        self.version = None
+        self.digest = None
+        self.verbose = verbose
+        self._stop_watching = threading.Event()
         self.load_model(model_path, metadata_path)
     
     def load_model(self, model_path, metadata_path):
-        """Load the trained model and metadata"""
-        try:
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"Model file '{model_path}' not found. Please train the model first.")
-            
-            if not os.path.exists(metadata_path):
-                raise FileNotFoundError(f"Metadata file '{metadata_path}' not found.")
-            
-            self.model = joblib.load(model_path)
-            metadata = joblib.load(metadata_path)
-            
-            self.feature_names = metadata['feature_names']
-            self.target_names = metadata['target_names']
-            
+        """Load the trained model and metadata; errors propagate to the caller.
+        
+        `model_path` may also be a model registry directory (see
+        model_registry.py), in which case its current version is loaded.
+        """
+        if os.path.isdir(model_path):
+            from model_registry import ModelRegistry
+            self.registry = ModelRegistry(model_path)
+            record = self.registry.current()
+            self.model, self.feature_names, self.target_names = read_version(self.registry, record)
+            self.version, self.digest = record['version'], record['digest']
+        else:
+            self.model, self.feature_names, self.target_names = read_model(model_path, metadata_path)
+        
+        if self.verbose:
             print("✓ Model loaded successfully!")
             print(f"✓ Features: {', '.join(self.feature_names)}")
             print(f"✓ Classes: {', '.join(self.target_names)}")
-            
-        except Exception as e:
-            print(f"❌ Error loading model: {str(e)}")
-            sys.exit(1)
+            if self.version is not None:
+                print(f"✓ Registry version: {self.version}")
+    
+    def reload(self):
+        """Load and warm the registry's current version if it changed, then swap it in.
+        
+        Only `self.model` is replaced, in one assignment; each prediction
+        reads it once, so calls already running finish on the model they
+        started with. A version with other features or classes is refused,
+        as callers hold on to those. Returns True if the model changed.
+        """
+        digest = self.registry.current_digest()
+        if digest is None or digest == self.digest:
+            return False
+        record = self.registry.resolve(digest)
+        model, feature_names, target_names = read_version(self.registry, record)
+        if list(feature_names) != list(self.feature_names) or list(target_names) != list(self.target_names):
+            raise ValueError(f"Version {record['version']} has different features or classes; restart to use it")
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            model.predict_proba(np.zeros((1, len(feature_names))))
+        self.model = model
+        self.version, self.digest = record['version'], record['digest']
+        print(f"✓ Switched to model version {self.version}", file=sys.stderr)
+        return True
+    
+    def watch(self, interval=2.0):
+        """Poll the registry's CURRENT pointer and reload in a background thread"""
+        if self.registry is None:
+            raise ValueError("Only a model loaded from a registry directory can be watched")
+        
+        def poll():
+            failed = None
+            while not self._stop_watching.wait(interval):
+                digest = self.registry.current_digest()
+                if digest == failed:
+                    # Already reported; wait for CURRENT to move on
+                    continue
+                try:
+                    self.reload()
+                except Exception as e:
+                    failed = digest
+                    print(f"❌ Model reload failed, keeping version {self.version}: {e}", file=sys.stderr)
+        
+        self._stop_watching.clear()
+        thread = threading.Thread(target=poll, name='model-watcher', daemon=True)
+        thread.start()
+        return thread
+    
+    def stop_watching(self):
+        self._stop_watching.set()
     
     def validate_input(self, value, feature_name):
         """Validate user input"""
@@ -58,6 +146,8 @@ class IrisPredictor:
     
     def get_user_input(self):
         """Get and validate user input"""
+        import pandas as pd
+        
         print("\n" + "="*50)
         print("🌺 Iris Flower Classification")
         print("Enter the flower measurements in centimeters:")
@@ -88,9 +178,9 @@ class IrisPredictor:
         """Make a single prediction from user input"""
         sample_df = self.get_user_input()
         
-        # Make prediction
-        prediction = self.model.predict(sample_df)[0]
-        probabilities = self.model.predict_proba(sample_df)[0]
+        # One pass over the forest, as in batch mode
+        predictions, probabilities = self.predict_batch(sample_df)
+        prediction, probabilities = predictions[0], probabilities[0]
         
         # Display results
         print("\n" + "="*50)
@@ -105,20 +195,158 @@ class IrisPredictor:
         return prediction, probabilities
     
     def predict_batch(self, data):
-        """Make predictions for multiple samples"""
+        """Make predictions for multiple samples with a single pass over the forest"""
+        if isinstance(data, np.ndarray):
+            return self.predict_array(data)
         if isinstance(data, list):
+            import pandas as pd
             data = pd.DataFrame(data, columns=self.feature_names)
         
-        predictions = self.model.predict(data)
-        probabilities = self.model.predict_proba(data)
+        # predict() would run every tree again; its answer is the argmax of these
+        model = self.model
+        probabilities = model.predict_proba(data)
+        predictions = model.classes_[probabilities.argmax(axis=1)]
         
         return predictions, probabilities
+    
+    def predict_array(self, X):
+        """Predictions for a 2-D float array, skipping the DataFrame round trip"""
+        model = self.model
+        with warnings.catch_warnings():
+            # The model was fitted on a DataFrame; plain arrays are in the same column order
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            probabilities = model.predict_proba(X)
+        return model.classes_[probabilities.argmax(axis=1)], probabilities
+    
+    def features(self, frame):
+        """Select the model's feature columns, by name or else by position"""
+        if isinstance(frame, np.ndarray):
+            if frame.ndim == 2 and frame.shape[1] == len(self.feature_names):
+                return frame
+            raise ValueError(f"Input must have {len(self.feature_names)} feature columns")
+        if all(name in frame.columns for name in self.feature_names):
+            return frame[self.feature_names]
+        if frame.shape[1] == len(self.feature_names):
+            return frame.set_axis(self.feature_names, axis=1)
+        raise ValueError(f"Input must have the columns: {', '.join(self.feature_names)}")
+    
+    def predict_stream(self, chunks):
+        """Yield (predictions, probabilities) for each chunk of feature rows"""
+        for chunk in chunks:
+            yield self.predict_batch(self.features(chunk))
+
+def infer_format(path):
+    """Input/output format from a file extension"""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    return {'json': 'jsonl', 'ndjson': 'jsonl'}.get(ext, ext)
+
+def read_npy_stream(stream, chunk_size):
+    """Yield row chunks of a C-order 2-D .npy array from a non-seekable stream"""
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    if fortran_order or len(shape) != 2:
+        raise ValueError("Expected a 2-D C-order array.")
+    row_bytes = shape[1] * dtype.itemsize
+    for start in range(0, shape[0], chunk_size):
+        rows = min(chunk_size, shape[0] - start)
+        yield np.frombuffer(stream.read(rows * row_bytes), dtype=dtype).reshape(rows, shape[1])
+
+def read_chunks(source, fmt, chunk_size, header=True):
+    """Yield chunks of at most chunk_size rows from a CSV, JSONL or .npy file, or '-' for stdin.
+    
+    CSV and JSONL chunks are DataFrames; .npy chunks stay plain arrays.
+    """
+    if fmt == 'npy':
+        if source == '-':
+            yield from read_npy_stream(sys.stdin.buffer, chunk_size)
+        else:
+            data = np.load(source, mmap_mode='r')
+            for start in range(0, len(data), chunk_size):
+                yield np.asarray(data[start:start + chunk_size])
+        return
+    import pandas as pd
+    stream = sys.stdin if source == '-' else source
+    if fmt == 'csv':
+        yield from pd.read_csv(stream, chunksize=chunk_size, header=0 if header else None)
+    elif fmt == 'jsonl':
+        yield from pd.read_json(stream, lines=True, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported input format: {fmt}")
+
+def write_predictions(out, predictions, probabilities, target_names, fmt, first):
+    """Append one chunk of predictions to an open text stream"""
+    columns = ['species'] + [f"prob_{name}" for name in target_names]
+    species = np.asarray(target_names, dtype=object)[predictions]
+    if fmt == 'jsonl':
+        import pandas as pd
+        result = pd.DataFrame(probabilities, columns=columns[1:])
+        result.insert(0, 'species', species)
+        text = result.to_json(orient='records', lines=True)
+        out.write(text if text.endswith('\n') else text + '\n')
+    else:
+        # Same text as DataFrame.to_csv(float_format='%.6f'), without importing pandas
+        if first:
+            out.write(','.join(columns) + '\n')
+        row_format = '%s' + ',%.6f' * len(target_names) + '\n'
+        out.write(''.join(row_format % row for row in zip(species, *probabilities.T.tolist())))
+
+def predict_file(predictor, source, output='-', input_format=None, output_format=None,
+                 chunk_size=100_000, header=True):
+    """Score a file or stdin chunk by chunk, writing results as each chunk finishes"""
+    input_format = input_format or ('csv' if source == '-' else infer_format(source))
+    output_format = output_format or ('csv' if output == '-' else infer_format(output))
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    
+    out = sys.stdout if output == '-' else open(output, 'w', newline='')
+    rows = 0
+    start = time.perf_counter()
+    try:
+        chunks = read_chunks(source, input_format, chunk_size, header)
+        for predictions, probabilities in predictor.predict_stream(chunks):
+            write_predictions(out, predictions, probabilities, predictor.target_names,
+                              output_format, first=rows == 0)
+            rows += len(predictions)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+    return rows
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Classify Iris flowers interactively or in batch.")
+    parser.add_argument('--input', help="CSV, JSONL or .npy file to score ('-' for stdin); omit for interactive mode")
+    parser.add_argument('--output', default='-', help="Where to write predictions (default: stdout)")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, help="Default: from the file extension")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, help="Default: from the file extension")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows scored per model call")
+    parser.add_argument('--no-header', action='store_true', help="CSV input has no header row")
+    parser.add_argument('--model', default='iris_model.npz',
+                        help="Compact .npz model, a sklearn .joblib model plus --metadata, or a registry directory")
+    parser.add_argument('--metadata', default='model_metadata.joblib')
+    args = parser.parse_args()
+    
+    try:
+        predictor = IrisPredictor(args.model, args.metadata, verbose=not args.input)
+    except Exception as e:
+        print(f"❌ Error loading model: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.input:
+        try:
+            predict_file(predictor, args.input, args.output, args.input_format, args.output_format,
+                         args.chunk_size, header=not args.no_header)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
     try:
-        predictor = IrisPredictor()
-        
         while True:
             predictor.predict_single()
             
@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from predict import IrisPredictor
+
+# HTTP/1.1 with keep-alive:
+#   POST /predict  {"features": [5.1, 3.5, 1.4, 0.2]}
+#              or  {"sepal length (cm)": 5.1, "sepal width (cm)": 3.5, ...}
+#              ->  {"species": "setosa", "probabilities": {"setosa": 1.0, ...}}
+#   GET  /stats    latency percentiles, throughput, batch sizes and model version
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class LatencyStats:
+    """Recent request latencies and batch sizes, summarised for /stats"""
+
+    def __init__(self, window=100_000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.started = None
+
+    def record_request(self, seconds):
+        if self.started is None:
+            self.started = time.perf_counter() - seconds
+        self.requests += 1
+        self.latencies.append(seconds)
+
+    def record_batch(self, size):
+        self.batch_sizes.append(size)
+
+    def summary(self):
+        if not self.latencies:
+            return {"requests": 0}
+        latencies = np.array(self.latencies) * 1000
+        elapsed = time.perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "throughput_rps": round(self.requests / elapsed, 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            "mean_batch": round(float(np.mean(self.batch_sizes)), 2),
+            "max_batch": int(max(self.batch_sizes)),
+        }
+
+
+class MicroBatcher:
+    """Collects concurrent single-row requests into one predict_proba call.
+
+    The first queued request opens a batch; whatever arrives within
+    `window` seconds (or while the previous batch is still running) joins
+    it, up to `max_batch` rows. Batches run one at a time on the executor,
+    so the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, predictor, executor, stats, max_batch=256, window=0.001):
+        self.predictor = predictor
+        self.executor = executor
+        self.stats = stats
+        self.max_batch = max_batch
+        self.window = window
+        self.queue = asyncio.Queue()
+
+    async def predict(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            if self.window:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            X = np.array([row for row, _ in batch], dtype=np.float64)
+            try:
+                predictions, probabilities = await loop.run_in_executor(
+                    self.executor, self.predictor.predict_array, X)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats.record_batch(len(batch))
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((predictions[i], probabilities[i]))
+
+
+class PredictionServer:
+    def __init__(self, predictor, batcher, stats):
+        self.predictor = predictor
+        self.batcher = batcher
+        self.stats = stats
+
+    def parse_features(self, body):
+        request = json.loads(body)
+        if isinstance(request, dict) and "features" in request:
+            row = request["features"]
+        elif isinstance(request, dict):
+            row = [request[name] for name in self.predictor.feature_names]
+        else:
+            raise ValueError
+        row = [float(value) for value in row]
+        if len(row) != len(self.predictor.feature_names):
+            raise ValueError
+        return row
+
+    async def route(self, method, path, body):
+        if method == "GET" and path == "/stats":
+            return 200, {**self.stats.summary(), "model_version": self.predictor.version}
+        if method != "POST" or path != "/predict":
+            return 404, {"error": "Use POST /predict or GET /stats."}
+        start = time.perf_counter()
+        try:
+            row = self.parse_features(body)
+        except (ValueError, KeyError, TypeError):
+            names = ", ".join(self.predictor.feature_names)
+            return 400, {"error": f"Expected {{\"features\": [4 numbers]}} or an object with: {names}."}
+        prediction, probabilities = await self.batcher.predict(row)
+        target_names = self.predictor.target_names
+        reply = {
+            "species": target_names[prediction],
+            "probabilities": {name: float(p) for name, p in zip(target_names, probabilities)},
+        }
+        self.stats.record_request(time.perf_counter() - start)
+        return 200, reply
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                try:
+                    status, reply = await self.route(method, path, body)
+                except Exception as e:
+                    status, reply = 500, {"error": str(e)}
+                payload = json.dumps(reply).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+                    .encode("latin1") + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, max_batch, window, model_path, metadata_path, reload_interval=2.0):
+    predictor = IrisPredictor(model_path, metadata_path, verbose=False)
+    # Warm up so the first request does not pay for lazy initialisation
+    predictor.predict_array(np.zeros((1, len(predictor.feature_names))))
+    if predictor.registry is not None and reload_interval > 0:
+        # New versions are loaded and warmed on the watcher thread; batches keep
+        # running on the old model until the swap
+        predictor.watch(reload_interval)
+    stats = LatencyStats()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batcher = MicroBatcher(predictor, executor, stats, max_batch, window)
+        batch_task = asyncio.create_task(batcher.run())
+        server = await asyncio.start_server(
+            PredictionServer(predictor, batcher, stats).handle_client, host, port)
+        print(f"Iris model server listening on http://{host}:{port}", file=sys.stderr, flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+            predictor.stop_watching()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve IrisPredictor over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=256, help="Most rows scored in one model call.")
+    parser.add_argument("--window-ms", type=float, default=1.0,
+                        help="How long a batch waits for more requests; 0 batches only what is already queued.")
+    parser.add_argument("--model", default="iris_model.npz",
+                        help="Compact .npz model, a sklearn .joblib model plus --metadata, or a registry directory.")
+    parser.add_argument("--metadata", default="model_metadata.joblib")
+    parser.add_argument("--reload-interval", type=float, default=2.0,
+                        help="Seconds between checks of a registry's current version; 0 disables reloading.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.window_ms / 1000,
+                          args.model, args.metadata, args.reload_interval))
+    except KeyboardInterrupt:
+        print("\nServer stopped.", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
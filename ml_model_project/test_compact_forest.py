@@ -0,0 +1,67 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+
+from chunked_training import merge_forests
+from compact_forest import CompactForest, export_forest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IRIS = load_iris()
+
+
+def parity_rows(forest, samples=20_000, seed=0):
+    """Iris rows, random rows around their range, and rows exactly on split thresholds"""
+    rng = np.random.default_rng(seed)
+    low, high = IRIS.data.min(axis=0) - 1, IRIS.data.max(axis=0) + 1
+    random_rows = rng.uniform(low, high, size=(samples, IRIS.data.shape[1]))
+    split_nodes = np.flatnonzero(np.isfinite(forest.threshold))
+    on_threshold = rng.uniform(low, high, size=(len(split_nodes), IRIS.data.shape[1]))
+    on_threshold[np.arange(len(split_nodes)), forest.feature[split_nodes]] = forest.threshold[split_nodes]
+    return np.vstack([IRIS.data, random_rows, on_threshold])
+
+
+def assert_same_predictions(model, forest):
+    X = parity_rows(forest)
+    for dtype in (np.float64, np.float32):
+        rows = X.astype(dtype)
+        np.testing.assert_array_equal(forest.predict_proba(rows), model.predict_proba(rows))
+        np.testing.assert_array_equal(forest.predict(rows), model.predict(rows))
+
+
+def export_and_load(model, path, mmap_mode=None):
+    export_forest(model, path, IRIS.feature_names, IRIS.target_names)
+    return CompactForest.load(path, mmap_mode=mmap_mode)
+
+
+@pytest.mark.parametrize('params', [
+    dict(n_estimators=100, max_depth=3),
+    dict(n_estimators=50, max_depth=None),
+    dict(n_estimators=30, max_depth=None, min_samples_leaf=3, max_features=None),
+])
+@pytest.mark.parametrize('mmap_mode', [None, 'r'])
+def test_matches_sklearn_exactly(tmp_path, params, mmap_mode):
+    model = RandomForestClassifier(random_state=42, **params).fit(IRIS.data, IRIS.target)
+    forest = export_and_load(model, tmp_path / 'forest.npz', mmap_mode)
+    assert_same_predictions(model, forest)
+
+
+def test_string_labels_and_merged_shards(tmp_path):
+    y = IRIS.target_names[IRIS.target]
+    shards = [RandomForestClassifier(n_estimators=5, random_state=seed).fit(IRIS.data, y)
+              for seed in range(4)]
+    model = merge_forests(shards)
+    forest = export_and_load(model, tmp_path / 'forest.npz')
+    assert forest.classes_.tolist() == model.classes_.tolist()
+    assert_same_predictions(model, forest)
+
+
+# Pickled by another sklearn version and fitted on a DataFrame; both only warn
+@pytest.mark.filterwarnings('ignore::UserWarning')
+def test_shipped_model_matches_its_export():
+    model = joblib.load(os.path.join(HERE, 'iris_model.joblib'))
+    forest = CompactForest.load(os.path.join(HERE, 'iris_model.npz'), mmap_mode='r')
+    assert_same_predictions(model, forest)
@@ -1,3 +1,5 @@
+import argparse
+import json
 import pandas as pd
 import numpy as np
 from sklearn.datasets import load_iris
@@ -7,6 +9,32 @@ from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import os
 
+from compact_forest import export_forest
+
+def save_model(model, feature_names, target_names, accuracy):
+    """Write the model, its metadata and, for forests, the compact NumPy copy"""
+    model_filename = 'iris_model.joblib'
+    joblib.dump(model, model_filename)
+    
+    # Also save feature names and target names for prediction
+    model_metadata = {
+        'feature_names': [str(name) for name in feature_names],
+        'target_names': [str(name) for name in target_names],
+        'accuracy': accuracy
+    }
+    joblib.dump(model_metadata, 'model_metadata.joblib')
+    
+    print(f"\nModel saved as '{model_filename}'")
+    print("Model metadata saved as 'model_metadata.joblib'")
+    if isinstance(model, RandomForestClassifier):
+        # Flattened copy that predicts with NumPy alone (see compact_forest.py)
+        export_forest(model, 'iris_model.npz', model_metadata['feature_names'], model_metadata['target_names'])
+        print("Compact model saved as 'iris_model.npz'")
+    elif os.path.exists('iris_model.npz'):
+        # Would otherwise still be picked up as the default model
+        os.remove('iris_model.npz')
+        print("Removed the outdated 'iris_model.npz'; use predict.py --model iris_model.joblib")
+
 def train_and_save_model():
     try:
         # Load data
@@ -56,20 +84,7 @@ def train_and_save_model():
         print("\nFeature Importance:")
         print(feature_importance)
         
-        # Save model
-        model_filename = 'iris_model.joblib'
-        joblib.dump(model, model_filename)
-        
-        # Also save feature names and target names for prediction
-        model_metadata = {
-            'feature_names': feature_names.tolist(),
-            'target_names': target_names.tolist(),
-            'accuracy': accuracy
-        }
-        joblib.dump(model_metadata, 'model_metadata.joblib')
-        
-        print(f"\nModel saved as '{model_filename}'")
-        print("Model metadata saved as 'model_metadata.joblib'")
+        save_model(model, feature_names, target_names, accuracy)
         
         return model, accuracy
         
@@ -77,5 +92,120 @@ def train_and_save_model():
         print(f"Error during model training: {str(e)}")
         raise
 
+def search_and_save_model(strategy='grid', space=None, n_iter=20, cv=5, n_jobs=-1,
+                          time_budget=None, report_path='search_report.json'):
+    """Pick hyperparameters by parallel k-fold search, then refit and save the best model"""
+    from model_search import print_report, run_search, save_report
+    
+    iris = load_iris(as_frame=True)
+    feature_names = iris.feature_names
+    target_names = iris.target_names
+    X_train, X_test, y_train, y_test = train_test_split(
+        iris.data, iris.target, test_size=0.2, random_state=42, stratify=iris.target
+    )
+    
+    print(f"Searching ({strategy}, {cv}-fold CV) on {X_train.shape[0]} training samples...")
+    report = run_search(X_train.to_numpy(), y_train.to_numpy(), space, strategy, n_iter, cv,
+                        n_jobs, time_budget)
+    print_report(report)
+    
+    print(f"\nRefitting best parameters on the full training set: {report['best_params']}")
+    model = RandomForestClassifier(random_state=42, n_jobs=n_jobs, **report['best_params'])
+    model.fit(X_train, y_train)
+    # Single-threaded prediction for the saved model, as before
+    model.n_jobs = None
+    y_pred = model.predict(X_test)
+    accuracy = accuracy_score(y_test, y_pred)
+    print(f"Test Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
+    print("\nClassification Report:")
+    print(classification_report(y_test, y_pred, target_names=target_names))
+    
+    report['test_accuracy'] = accuracy
+    save_report(report, report_path)
+    print(f"Search report saved as '{report_path}'")
+    save_model(model, feature_names, target_names, accuracy)
+    return model, report
+
+def train_out_of_core(data_path, target, features=None, chunk_rows=100_000, learner='forest',
+                      epochs=5, trees_per_shard=10, max_depth=3, holdout_every=10, n_jobs=None):
+    """Train on a CSV or Parquet file chunk by chunk, so memory stays bounded by the chunk size"""
+    from chunked_training import PassMeter, evaluate, open_loader, scan_classes, train_forest, train_sgd
+    
+    loader = open_loader(data_path, target, features, chunk_rows)
+    meter = PassMeter()
+    print(f"Training on '{data_path}' in chunks of {chunk_rows:,} rows ({learner})...")
+    print(f"Features: {', '.join(loader.features)}")
+    classes = scan_classes(loader, meter)
+    print(f"Target classes: {', '.join(str(label) for label in classes)}")
+    
+    if learner == 'forest':
+        model = train_forest(loader, classes, meter, trees_per_shard, max_depth, holdout_every, n_jobs)
+        print(f"Merged {model.n_estimators} trees from {meter.passes[-1]['shards']} shards")
+    else:
+        model = train_sgd(loader, classes, meter, epochs, holdout_every)
+    accuracy = evaluate(model, loader, classes, meter, holdout_every)
+    if accuracy is not None:
+        print(f"Held-out accuracy (every {holdout_every}th chunk): {accuracy:.4f} ({accuracy*100:.2f}%)")
+    
+    save_model(model, loader.features, classes, accuracy)
+    return model, meter.passes
+
+def publish_model(registry_root, note=''):
+    """Add the files save_model just wrote to a model registry and make them current"""
+    from model_registry import MODEL_FILES, ModelRegistry
+    
+    registry = ModelRegistry(registry_root)
+    accuracy = joblib.load('model_metadata.joblib').get('accuracy')
+    files = [name for name in MODEL_FILES if os.path.exists(name)]
+    record = registry.publish(files, note, None if accuracy is None else float(accuracy))
+    registry.promote(record['version'])
+    print(f"Published to '{registry_root}' as version {record['version']} ({record['digest'][:12]}), now current")
+    return record
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Iris classifier, optionally with a hyperparameter search.")
+    parser.add_argument('--search', choices=['grid', 'random'],
+                        help="Choose parameters by k-fold cross-validated search instead of the fixed model")
+    parser.add_argument('--params', help="JSON file mapping parameter names to lists of values to search")
+    parser.add_argument('--n-iter', type=int, default=20, help="Candidates drawn by a random search")
+    parser.add_argument('--cv', type=int, default=5, help="Number of folds")
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="Search worker processes, or threads per forest shard with --data (-1: all cores)")
+    parser.add_argument('--time-budget', type=float, help="Seconds after which no new fits are started")
+    parser.add_argument('--report', default='search_report.json')
+    parser.add_argument('--data', help="Train out of core on this CSV or Parquet file instead of the Iris dataset")
+    parser.add_argument('--target', default='species', help="Label column of --data")
+    parser.add_argument('--features', help="Comma-separated feature columns of --data (default: all others)")
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help="Rows read per chunk")
+    parser.add_argument('--learner', choices=['forest', 'sgd'], default='forest',
+                        help="Merge per-chunk forest shards, or SGD logistic regression with partial_fit")
+    parser.add_argument('--epochs', type=int, default=5, help="Passes for the sgd learner")
+    parser.add_argument('--trees-per-shard', type=int, default=10)
+    parser.add_argument('--max-depth', type=int, default=3, help="Tree depth for forest shards (0: unlimited)")
+    parser.add_argument('--holdout-every', type=int, default=10,
+                        help="Keep every Nth chunk for evaluation (0: train on everything)")
+    parser.add_argument('--registry', help="Also publish the model to this registry directory and make it current")
+    parser.add_argument('--note', default='', help="Description stored with the registry version")
+    args = parser.parse_args()
+    
+    if args.data:
+        if args.search:
+            parser.error("--search works on the in-memory Iris dataset, not with --data")
+        features = args.features.split(',') if args.features else None
+        train_out_of_core(args.data, args.target, features, args.chunk_rows, args.learner, args.epochs,
+                          args.trees_per_shard, args.max_depth or None, args.holdout_every, args.jobs)
+    elif args.search:
+        space = None
+        if args.params:
+            with open(args.params) as f:
+                space = json.load(f)
+        search_and_save_model(args.search, space, args.n_iter, args.cv, args.jobs,
+                              args.time_budget, args.report)
+    else:
+        train_and_save_model()
+    
+    if args.registry:
+        publish_model(args.registry, args.note)
+
 if __name__ == "__main__":
-    train_and_save_model()
\ No newline at end of file
+    main()
\ No newline at end of file
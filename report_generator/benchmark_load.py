@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+import time
+
+from benchmark_report import write_csv
+from columnar import convert_csv
+from report_generator import load_data
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    print(f"{'rows':>12} {'format':>9} {'Score only':>11} {'all columns':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_rows in sizes:
+            csv_file = os.path.join(tmp, f"data_{num_rows}.csv")
+            cols_dir = os.path.join(tmp, f"data_{num_rows}.cols")
+            write_csv(csv_file, num_rows)
+            convert_csv(csv_file, cols_dir)
+            for label, path in (("csv", csv_file), ("columnar", cols_dir)):
+                score_only = timed(lambda: load_data(path, ["Score"]))
+                everything = timed(lambda: load_data(path))
+                print(f"{num_rows:>12,} {label:>9} {score_only:>10.3f}s {everything:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
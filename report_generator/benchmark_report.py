@@ -0,0 +1,72 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SIZES = (10_000, 1_000_000, 10_000_000)
+
+
+def write_csv(path, num_rows, block=1_000_000, seed=42):
+    """Write a synthetic Name/Score CSV in blocks, without holding it all."""
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="") as f:
+        f.write("Name,Score\n")
+        for start in range(0, num_rows, block):
+            n = min(block, num_rows - start)
+            letters = rng.integers(ord("A"), ord("Z") + 1, size=(n, 6), dtype=np.uint8)
+            names = letters.view("S6").ravel().astype(str)
+            scores = rng.integers(0, 101, size=n)
+            pd.DataFrame({"Name": names, "Score": scores}).to_csv(f, header=False, index=False)
+
+
+def run_child(data_file, out_file, workers):
+    """Build one report and print wall time and this process's peak RSS."""
+    from parallel_report import generate_parallel_pdf
+    from streaming_report import generate_streaming_pdf
+
+    start = time.perf_counter()
+    if workers:
+        generate_parallel_pdf(data_file, out_file, workers)
+    else:
+        generate_streaming_pdf(data_file, out_file)
+    elapsed = time.perf_counter() - start
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"RESULT {elapsed:.3f} {peak_kib}")
+
+
+def main(sizes, workers=0):
+    workdir = tempfile.mkdtemp()
+    print(f"{'rows':>12} {'seconds':>10} {'rows/s':>12} {'peak RSS':>10} {'PDF size':>10}")
+    for num_rows in sizes:
+        data_file = os.path.join(workdir, f"data_{num_rows}.csv")
+        out_file = os.path.join(workdir, f"report_{num_rows}.pdf")
+        write_csv(data_file, num_rows)
+        # A fresh process per size so peak RSS is not carried over
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", data_file, out_file, str(workers)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        elapsed, peak_kib = output.split("RESULT")[1].split()
+        elapsed = float(elapsed)
+        print(f"{num_rows:>12,} {elapsed:>10.2f} {num_rows / elapsed:>12,.0f} "
+              f"{int(peak_kib) / 1024:>8.0f} MB {os.path.getsize(out_file) / 2 ** 20:>7.1f} MB")
+        os.remove(data_file)
+        os.remove(out_file)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        run_child(args[1], args[2], int(args[3]))
+    else:
+        workers = 0
+        if "--workers" in args:
+            i = args.index("--workers")
+            workers = int(args[i + 1])
+            del args[i:i + 2]
+        main([int(arg) for arg in args] or DEFAULT_SIZES, workers)
@@ -0,0 +1,46 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from report_generator import PDFReport
+
+DEFAULT_ROWS = 50_000
+
+
+def cell_rows(pdf, df):
+    """The previous per-row path: iterrows and two cell() calls plus ln()."""
+    for i, row in df.iterrows():
+        fill = i % 2 == 0
+        pdf.cell(70, 8, row["Name"], 1, 0, "C", fill)
+        pdf.cell(40, 8, f"{row['Score']}", 1, 0, "C", fill)
+        pdf.ln()
+
+
+def batched_rows(pdf, df):
+    pdf.add_table_rows(df["Name"], df["Score"])
+
+
+def rows_per_second(render, df):
+    pdf = PDFReport()
+    pdf.add_page()
+    pdf.table_header()
+    start = time.perf_counter()
+    render(pdf, df)
+    return len(df) / (time.perf_counter() - start), pdf.page
+
+
+if __name__ == "__main__":
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    rng = np.random.default_rng(0)
+    letters = rng.integers(ord("A"), ord("Z") + 1, size=(num_rows, 6), dtype=np.uint8)
+    df = pd.DataFrame({
+        "Name": letters.view("S6").ravel().astype(str),
+        "Score": rng.integers(0, 101, size=num_rows),
+    })
+    baseline, pages = rows_per_second(cell_rows, df)
+    batched, _ = rows_per_second(batched_rows, df)
+    print(f"{num_rows:,} rows, {pages} pages")
+    print(f"cell() per row:  {baseline:>12,.0f} rows/s")
+    print(f"batched rows:    {batched:>12,.0f} rows/s ({batched / baseline:.1f}x)")
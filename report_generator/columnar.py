@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+TEXT = "text"
+# Pinned so every chunk of a CSV parses alike, whatever rows it happens to hold
+CSV_DTYPES = {"Name": str, "Score": "float64"}
+
+
+def is_columnar(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+class ColumnarWriter:
+    """Append DataFrame chunks to a columnar directory.
+
+    Numeric columns are raw little-endian arrays in `<column>.bin`. Text
+    columns are a UTF-8 blob in `<column>.bin` plus int64 end offsets in
+    `<column>.idx`. `meta.json` holds the row count and is rewritten
+    atomically on close, so readers never see a half-written chunk.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.columns = None
+        self.rows = 0
+        self.text_sizes = {}
+        self.files = {}
+        self.mode = "ab" if append else "wb"
+        if append and is_columnar(path):
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+            self.columns = meta["columns"]
+            self.rows = meta["rows"]
+            for name, kind in self.columns.items():
+                self._truncate(name, kind)
+        elif is_columnar(path):
+            os.remove(os.path.join(path, META_FILE))
+
+    def _file(self, name, ext):
+        return os.path.join(self.path, name + ext)
+
+    def _truncate(self, name, kind):
+        # Drop bytes past the last committed row left by an interrupted append
+        if kind == TEXT:
+            offsets = np.fromfile(self._file(name, ".idx"), dtype="<i8", count=self.rows)
+            size = int(offsets[-1]) if self.rows else 0
+            self.text_sizes[name] = size
+            os.truncate(self._file(name, ".idx"), self.rows * 8)
+        else:
+            size = self.rows * np.dtype(kind).itemsize
+        os.truncate(self._file(name, ".bin"), size)
+
+    def _open(self, name, ext):
+        key = name + ext
+        if key not in self.files:
+            self.files[key] = open(self._file(name, ext), self.mode)
+        return self.files[key]
+
+    def append(self, df):
+        """Append a DataFrame, or a dict of equal-length arrays, as new rows."""
+        columns = {name: np.asarray(df[name]) for name in (df.columns if hasattr(df, "columns") else df)}
+        if self.columns is None:
+            self.columns = {
+                name: TEXT if values.dtype.kind in "OSU" else values.dtype.newbyteorder("<").str
+                for name, values in columns.items()
+            }
+            self.text_sizes = {name: 0 for name, kind in self.columns.items() if kind == TEXT}
+        elif list(columns) != list(self.columns):
+            raise ValueError(f"Expected columns {list(self.columns)}, got {list(columns)}.")
+
+        rows = 0
+        for name, kind in self.columns.items():
+            values = columns[name]
+            rows = len(values)
+            if kind != TEXT:
+                self._open(name, ".bin").write(values.astype(kind, copy=False).tobytes())
+                continue
+            if values.dtype.kind == "S" and np.all(np.char.str_len(values) == values.itemsize):
+                # Fixed-width bytes with no padding: the buffer is the blob
+                blob = values.tobytes()
+                lengths = np.full(rows, values.itemsize, dtype="<i8")
+            else:
+                encoded = [value if isinstance(value, bytes) else str(value).encode("utf-8")
+                           for value in values]
+                blob = b"".join(encoded)
+                lengths = np.fromiter(map(len, encoded), dtype="<i8", count=rows)
+            ends = self.text_sizes[name] + np.cumsum(lengths)
+            self._open(name, ".bin").write(blob)
+            self._open(name, ".idx").write(ends.tobytes())
+            if rows:
+                self.text_sizes[name] = int(ends[-1])
+        self.rows += rows
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"rows": self.rows, "columns": self.columns or {}}, f)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def decode_text(data, ends):
+    """Split a UTF-8 blob at `ends` into an object array of str.
+
+    ASCII blobs, the usual case, are scattered into a fixed-width byte
+    matrix and converted by NumPy in one call instead of per string.
+    """
+    lengths = np.diff(ends, prepend=0)
+    width = int(lengths.max()) if len(lengths) else 0
+    if width == 0:
+        return np.full(len(ends), "", dtype=object)
+    if data.max() < 128 and data.min() > 0:
+        if lengths.min() == width:
+            return data.view(f"S{width}").astype("U").astype(object)
+        rows = np.repeat(np.arange(len(ends)), lengths)
+        cols = np.arange(len(data)) - np.repeat(ends - lengths, lengths)
+        matrix = np.zeros((len(ends), width), dtype="u1")
+        matrix[rows, cols] = data
+        return matrix.view(f"S{width}").ravel().astype("U").astype(object)
+    raw = data.tobytes()
+    starts = (ends - lengths).tolist()
+    return np.array([raw[a:b].decode("utf-8") for a, b in zip(starts, ends.tolist())], dtype=object)
+
+
+class ColumnarData:
+    """Read-only, memory-mapped view of a columnar directory.
+
+    Nothing is read until a column is asked for, and numeric columns are
+    returned as memory maps, so a report section that only needs scores
+    never touches the names.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.rows = meta["rows"]
+        self.columns = meta["columns"]
+        self._maps = {}
+
+    def __len__(self):
+        return self.rows
+
+    def _map(self, name, ext, dtype, count):
+        key = name + ext
+        if key not in self._maps:
+            if count == 0:
+                self._maps[key] = np.empty(0, dtype=dtype)
+            else:
+                path = os.path.join(self.path, key)
+                self._maps[key] = np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+        return self._maps[key]
+
+    def column(self, name, start=0, stop=None):
+        if name not in self.columns:
+            raise KeyError(name)
+        stop = self.rows if stop is None else min(stop, self.rows)
+        kind = self.columns[name]
+        if kind != TEXT:
+            return self._map(name, ".bin", kind, self.rows)[start:stop]
+
+        ends = self._map(name, ".idx", "<i8", self.rows)[start:stop]
+        if len(ends) == 0:
+            return np.empty(0, dtype=object)
+        base = int(self._maps[name + ".idx"][start - 1]) if start else 0
+        blob = self._map(name, ".bin", "u1", int(self._maps[name + ".idx"][-1]))
+        return decode_text(np.asarray(blob[base:int(ends[-1])]), np.asarray(ends) - base)
+
+    def digest(self, start, stop):
+        """sha1 of the stored bytes of rows [start, stop), position-independent."""
+        h = hashlib.sha1()
+        for name, kind in self.columns.items():
+            if kind != TEXT:
+                h.update(self._map(name, ".bin", kind, self.rows)[start:stop].tobytes())
+                continue
+            index = self._map(name, ".idx", "<i8", self.rows)
+            base = int(index[start - 1]) if start else 0
+            end = int(index[stop - 1]) if stop > start else base
+            h.update((index[start:stop] - base).tobytes())
+            h.update(self._map(name, ".bin", "u1", int(index[-1]))[base:end].tobytes())
+        return h.hexdigest()
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def frame(self, columns=None, start=0, stop=None):
+        columns = list(self.columns) if columns is None else columns
+        return pd.DataFrame({name: self.column(name, start, stop) for name in columns})
+
+    def chunks(self, chunk_size, columns=None):
+        for start in range(0, self.rows, chunk_size):
+            yield self.frame(columns, start, start + chunk_size)
+
+
+def read_chunks(data_file, chunk_size, columns=None):
+    """DataFrame chunks from either a CSV file or a columnar directory."""
+    if is_columnar(data_file):
+        return ColumnarData(data_file).chunks(chunk_size, columns)
+    return pd.read_csv(data_file, usecols=columns, dtype=CSV_DTYPES, chunksize=chunk_size)
+
+
+def convert_csv(csv_file, out_dir, chunk_size=1_000_000):
+    """Write a columnar copy of a CSV, reading it in chunks."""
+    with ColumnarWriter(out_dir) as writer:
+        for chunk in pd.read_csv(csv_file, dtype=CSV_DTYPES, chunksize=chunk_size):
+            writer.append(chunk)
+    return writer.rows
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python columnar.py data.csv data.cols")
+    rows = convert_csv(sys.argv[1], sys.argv[2])
+    print(f"Wrote {rows} rows to {sys.argv[2]}")
@@ -1,5 +1,7 @@
-import pandas as pd
+import numpy as np
 from fpdf import FPDF
+from report_model import ReportModel
+from table_writer import format_column, format_scores, write_rows
 
 class PDFReport(FPDF):
     def header(self):
@@ -21,20 +23,20 @@ def add_table_header(pdf):
     pdf.cell(40, 10, "Score", border=1, align='R')
     pdf.ln()
 
-def add_table_row(pdf, name, score, fill):
+def add_table_rows(pdf, names, scores, first_index=0):
+    # Row style is set once; page breaks carry it over to the next page
     pdf.set_font("Arial", '', 12)
     pdf.set_fill_color(230, 230, 230)  # light grey
-    pdf.cell(100, 10, name, border=1, fill=fill)
-    pdf.cell(40, 10, str(score), border=1, align='R', fill=fill)
-    pdf.ln()
-
-# Read data
-df = pd.read_csv('data.csv')
+    fills = np.arange(first_index, first_index + len(names)) % 2 == 1
+    texts = [format_column(names), format_scores(scores)]
+    write_rows(pdf, [(100, ''), (40, 'R')], texts, fills.tolist(), 10)
 
-# Calculate stats
-average_score = df['Score'].mean()
-highest_score = df['Score'].max()
-lowest_score = df['Score'].min()
+# Read data and calculate stats once, through the shared report model
+model = ReportModel('data.csv')
+stats = model.stats
+average_score = stats['Average']
+highest_score = stats['Highest']
+lowest_score = stats['Lowest']
 
 # Create PDF
 pdf = PDFReport()
@@ -42,10 +44,8 @@ pdf.add_page()
 
 # Add table with striped rows
 add_table_header(pdf)
-fill = False
-for _, row in df.iterrows():
-    add_table_row(pdf, row['Name'], row['Score'], fill)
-    fill = not fill
+for first_index, names, scores in model.table_chunks():
+    add_table_rows(pdf, names, scores, first_index)
 
 # Add summary box
 pdf.ln(10)
@@ -0,0 +1,245 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from columnar import CSV_DTYPES, META_FILE, ColumnarData, is_columnar
+from parallel_report import render_shard
+from report_stats import ScoreStatistics
+from streaming_report import StreamingPDFReport, rows_per_page
+
+CACHE_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def file_stat(path):
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class CsvSource:
+    """Page-aligned shards of a CSV, found by scanning its bytes for newlines.
+
+    Shards are hashed as raw bytes, so an unchanged shard is never parsed.
+    This needs one record per line (no blank lines or quoted newlines);
+    load() checks the parsed row count against the scan.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = b""
+
+    def stat(self):
+        return file_stat(self.path)
+
+    def scan(self, shard_rows):
+        """Header digest and a list of [start, end, rows, sha1] shards."""
+        shards = []
+        with open(self.path, "rb") as f:
+            self.header = f.readline()
+            start = pos = f.tell()
+            rows = 0
+            digest = hashlib.sha1()
+            last_byte = b"\n"
+            while True:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    break
+                view = memoryview(block)
+                newlines = np.flatnonzero(np.frombuffer(block, dtype="u1") == 10)
+                used = taken = 0
+                while len(newlines) - taken >= shard_rows - rows:
+                    taken += shard_rows - rows
+                    cut = int(newlines[taken - 1]) + 1
+                    digest.update(view[used:cut])
+                    shards.append([start, pos + cut, shard_rows, digest.hexdigest()])
+                    start, used, rows = pos + cut, cut, 0
+                    digest = hashlib.sha1()
+                digest.update(view[used:])
+                rows += len(newlines) - taken
+                pos += len(block)
+                last_byte = block[-1:]
+        if pos > start:
+            shards.append([start, pos, rows + (last_byte != b"\n"), digest.hexdigest()])
+        return hashlib.sha1(self.header).hexdigest(), shards
+
+    def load(self, shard):
+        start, end, rows, _ = shard
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            # Pinned dtypes: a shard must parse as it would inside the whole file
+            chunk = pd.read_csv(io.BytesIO(self.header + f.read(end - start)), dtype=CSV_DTYPES)
+        if len(chunk) != rows:
+            raise ValueError("CSV has blank or multi-line records; build it without --incremental.")
+        return chunk
+
+
+class ColumnarSource:
+    """Page-aligned shards of a columnar directory, hashed from its column files."""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+
+    def __getstate__(self):
+        # Worker processes map the files themselves
+        return {"path": self.path, "data": None}
+
+    def stat(self):
+        return file_stat(os.path.join(self.path, META_FILE))
+
+    def scan(self, shard_rows):
+        data = self.data = ColumnarData(self.path)
+        header = hashlib.sha1(json.dumps(data.columns).encode()).hexdigest()
+        shards = []
+        for start in range(0, len(data), shard_rows):
+            stop = min(start + shard_rows, len(data))
+            shards.append([start, stop, stop - start, data.digest(start, stop)])
+        return header, shards
+
+    def load(self, shard):
+        if self.data is None:
+            self.data = ColumnarData(self.path)
+        return self.data.frame(None, shard[0], shard[1])
+
+
+class ShardCache:
+    """Rendered pages and partial statistics per shard, plus a manifest."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(os.path.join(cache_dir, MANIFEST_FILE)) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def _path(self, index):
+        return os.path.join(self.cache_dir, f"shard-{index:06d}.pkl")
+
+    def _write(self, path, data):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def reusable(self, layout, header, shards):
+        """Indexes of shards whose rows and hash match the cached ones."""
+        if self.manifest.get("layout") != layout or self.manifest.get("header") != header:
+            return set()
+        old = self.manifest.get("shards", [])
+        return {
+            i for i, shard in enumerate(shards)
+            if i < len(old) and old[i][2:] == shard[2:] and os.path.exists(self._path(i))
+        }
+
+    def store(self, index, pages, stats):
+        self._write(self._path(index), pickle.dumps((pages, stats), pickle.HIGHEST_PROTOCOL))
+
+    def load(self, index):
+        with open(self._path(index), "rb") as f:
+            return pickle.load(f)
+
+    def commit(self, manifest, shard_count):
+        index = shard_count
+        while os.path.exists(self._path(index)):
+            os.remove(self._path(index))
+            index += 1
+        self._write(os.path.join(self.cache_dir, MANIFEST_FILE), json.dumps(manifest).encode())
+        self.manifest = manifest
+
+
+def _render(source, shard, index, shard_rows, pages_per_shard):
+    chunk = source.load(shard)
+    if "Name" not in chunk.columns or "Score" not in chunk.columns:
+        raise ValueError("Data must contain 'Name' and 'Score' columns.")
+    return render_shard(
+        chunk["Name"].astype(str).tolist(),
+        chunk["Score"].tolist(),
+        index * shard_rows,
+        1 + index * pages_per_shard,
+    )
+
+
+def generate_incremental_pdf(data_file, out_file, cache_dir=None, workers=0, pages_per_shard=100):
+    """Rebuild the streaming report, re-rendering only shards whose rows changed.
+
+    The input is cut into page-aligned shards, hashed, and compared with the
+    cache from the last build. Unchanged shards reuse their rendered pages
+    and partial statistics. Edited or appended ones are rendered again,
+    across `workers` processes if given. If neither the input nor the report
+    has changed since the last build, nothing is read at all. Shards are
+    parsed with the same pinned dtypes as streaming chunks, so the output
+    is byte-identical to a full streaming build.
+    """
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"File not found: {data_file}")
+
+    source = ColumnarSource(data_file) if is_columnar(data_file) else CsvSource(data_file)
+    cache = ShardCache(cache_dir or os.path.splitext(out_file)[0] + ".cache")
+    page_rows = rows_per_page()
+    layout = [CACHE_VERSION, page_rows, pages_per_shard]
+    input_stat = source.stat()
+    manifest = cache.manifest
+    if (manifest.get("layout") == layout and manifest.get("input_stat") == input_stat
+            and manifest.get("output_stat") == file_stat(out_file)):
+        print(f"PDF report is up to date: {out_file}")
+        return
+
+    shard_rows = page_rows * pages_per_shard
+    header, shards = source.scan(shard_rows)
+    if not shards:
+        raise ValueError("Data contains no rows.")
+    reuse = cache.reusable(layout, header, shards)
+    stale = [i for i in range(len(shards)) if i not in reuse]
+
+    if workers and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for i in stale:
+                pending.append((i, executor.submit(
+                    _render, source, shards[i], i, shard_rows, pages_per_shard)))
+                while len(pending) >= 2 * workers:
+                    i, future = pending.popleft()
+                    cache.store(i, *future.result())
+            while pending:
+                i, future = pending.popleft()
+                cache.store(i, *future.result())
+    else:
+        for i in stale:
+            cache.store(i, *_render(source, shards[i], i, shard_rows, pages_per_shard))
+
+    tmp_file = out_file + ".tmp"
+    pdf = StreamingPDFReport(tmp_file)
+    stats = ScoreStatistics()
+    try:
+        for i in range(len(shards)):
+            pages, partial = cache.load(i)
+            pdf.append_rendered_pages(pages)
+            stats.merge(partial)
+        pdf.add_summary_page(stats)
+    except BaseException:
+        pdf.abort()
+        raise
+    pdf.finish()
+    os.replace(tmp_file, out_file)
+
+    cache.commit({
+        "layout": layout,
+        "header": header,
+        "shards": shards,
+        "input_stat": input_stat,
+        "output_stat": file_stat(out_file),
+    }, len(shards))
+    print(f"PDF report generated: {out_file} "
+          f"({len(reuse)} of {len(shards)} shards reused, {len(stale)} rendered)")
@@ -0,0 +1,71 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from columnar import read_chunks
+from report_stats import ScoreStatistics
+from streaming_report import StreamingPDFReport, rows_per_page
+
+
+def render_shard(names, scores, first_index, page_number_offset):
+    """Render one page-aligned shard of the table in a worker process.
+
+    Returns the finished page contents and the shard's statistics, which
+    the parent merges.
+    """
+    pdf = StreamingPDFReport(page_number_offset=page_number_offset)
+    try:
+        pdf.add_rows(names, scores, first_index)
+        pdf.end_page()
+        return pdf.rendered_pages(), ScoreStatistics().update(scores)
+    finally:
+        pdf.pages.close()
+
+
+def generate_parallel_pdf(data_file, out_file, workers=None, pages_per_shard=200):
+    """Build the streaming report with table pages rendered across processes.
+
+    Shards are whole pages, so every worker knows its page numbers up front.
+    Results are stitched back in order and at most two shards per worker
+    are in flight, which keeps memory bounded. The output is byte-identical
+    to generate_streaming_pdf for the same input.
+    """
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"File not found: {data_file}")
+
+    workers = workers or os.cpu_count() or 1
+    page_rows = rows_per_page()
+    shard_rows = page_rows * pages_per_shard
+    pdf = StreamingPDFReport(out_file)
+    stats = ScoreStatistics()
+
+    def collect(future):
+        contents, partial = future.result()
+        pdf.append_rendered_pages(contents)
+        stats.merge(partial)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for shard, chunk in enumerate(read_chunks(data_file, shard_rows)):
+                if "Name" not in chunk.columns or "Score" not in chunk.columns:
+                    raise ValueError("CSV must contain 'Name' and 'Score' columns.")
+                pending.append(executor.submit(
+                    render_shard,
+                    chunk["Name"].astype(str).tolist(),
+                    chunk["Score"].tolist(),
+                    shard * shard_rows,
+                    1 + shard * pages_per_shard,
+                ))
+                while len(pending) >= 2 * workers:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        if stats.count == 0:
+            raise ValueError("CSV contains no rows.")
+        pdf.add_summary_page(stats)
+    except BaseException:
+        pdf.abort()
+        raise
+    pdf.finish()
+    print(f"PDF report generated: {out_file}")
@@ -0,0 +1,154 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+BAR_COLOR = "#3b8eea"
+MAX_NAMED_BARS = 30
+TOP_N = 20
+SERIES_POINTS = 500
+KINDS = ("auto", "bars", "top", "histogram", "series")
+
+_template = {}
+
+
+def _axes(title, xlabel, ylabel):
+    """Return the cached figure's axes, cleared and labelled.
+
+    The figure and its Agg canvas are built once per process and reused for
+    every chart; only the plotted data changes between calls.
+    """
+    if not _template:
+        figure = Figure(figsize=(7, 4))
+        FigureCanvasAgg(figure)
+        _template["figure"] = figure
+        _template["axes"] = figure.add_subplot()
+    ax = _template["axes"]
+    ax.clear()
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    return ax
+
+
+def _save(out_file):
+    figure = _template["figure"]
+    figure.tight_layout()
+    figure.savefig(out_file)
+
+
+def choose_kind(num_rows):
+    """Pick a chart that stays readable, and cheap, at this row count."""
+    return "bars" if num_rows <= MAX_NAMED_BARS else "histogram"
+
+
+def top_n(names, scores, n=TOP_N):
+    """The n highest scores with their names, highest first."""
+    scores = np.asarray(scores)
+    if len(scores) > n:
+        best = np.argpartition(scores, -n)[-n:]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(scores[best], kind="stable")[::-1]]
+    return np.asarray(names, dtype=object)[best], scores[best]
+
+
+def score_histogram(scores, low=0, high=100, bucket_width=1):
+    """Bucket counts over [low, high] with the same buckets as ScoreStatistics."""
+    scores = np.asarray(scores, dtype="float64")
+    scores = scores[~np.isnan(scores)]
+    edges = np.arange(low, high + bucket_width, bucket_width, dtype="float64")
+    buckets = np.floor((scores - low) / bucket_width).astype("int64")
+    np.clip(buckets, 0, len(edges) - 1, out=buckets)
+    return edges, np.bincount(buckets, minlength=len(edges))
+
+
+def lttb(y, points=SERIES_POINTS):
+    """Indices of a Largest-Triangle-Three-Buckets downsample of y.
+
+    Keeps the first and last sample and, from each of `points - 2` equal
+    buckets in between, the sample forming the largest triangle with the
+    previously kept sample and the mean of the next bucket.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n <= points or points < 3:
+        return np.arange(n)
+    bounds = np.linspace(1, n - 1, points - 1).astype("int64")
+    keep = np.empty(points, dtype="int64")
+    keep[0] = 0
+    keep[-1] = n - 1
+    for b in range(points - 2):
+        start, stop = bounds[b], bounds[b + 1]
+        if b + 2 < len(bounds):
+            next_start, next_stop = bounds[b + 1], bounds[b + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        next_x = (next_start + next_stop - 1) / 2
+        next_y = y[next_start:next_stop].mean()
+        prev = keep[b]
+        xs = np.arange(start, stop)
+        area = np.abs((prev - next_x) * (y[start:stop] - y[prev]) - (prev - xs) * (next_y - y[prev]))
+        keep[b + 1] = start + int(area.argmax())
+    return keep
+
+
+def plot_bars(names, scores, out_file, title="Student Scores"):
+    ax = _axes(title, "Name", "Score")
+    ax.bar([str(name) for name in names], scores, color=BAR_COLOR)
+    if len(names) > 10:
+        ax.tick_params(axis="x", labelrotation=90, labelsize=7)
+    _save(out_file)
+
+
+def plot_histogram(edges, counts, out_file, bucket_width=1):
+    """Draw precomputed bucket counts; cost depends on buckets, not rows."""
+    ax = _axes("Score Distribution", "Score", "Students")
+    ax.bar(edges, counts, width=bucket_width, align="edge", color=BAR_COLOR)
+    _save(out_file)
+
+
+def chart_spec(kind, names, scores):
+    """The data a chart of this kind draws, reduced to a size-independent form.
+
+    `names` may be a callable returning the names, so kinds that never
+    show names (histogram, series) never load them.
+    """
+    scores = np.asarray(scores)
+    if kind == "auto":
+        kind = choose_kind(len(scores))
+    if kind == "bars":
+        names = names() if callable(names) else names
+        return {"kind": kind, "names": [str(name) for name in names], "scores": scores}
+    if kind == "top":
+        names = names() if callable(names) else names
+        best_names, best = top_n(np.asarray(names, dtype=object), scores)
+        return {"kind": kind, "names": [str(name) for name in best_names], "scores": best}
+    if kind == "histogram":
+        edges, counts = score_histogram(scores)
+        return {"kind": kind, "edges": edges, "counts": counts, "bucket_width": 1}
+    if kind == "series":
+        keep = lttb(scores)
+        return {"kind": kind, "rows": keep, "scores": scores[keep]}
+    raise ValueError(f"Unknown chart kind: {kind}")
+
+
+def draw_chart(spec, out_file):
+    """Draw a chart_spec to a file name or file object."""
+    kind = spec["kind"]
+    if kind == "bars":
+        plot_bars(spec["names"], spec["scores"], out_file)
+    elif kind == "top":
+        plot_bars(spec["names"], spec["scores"], out_file, title=f"Top {len(spec['scores'])} Scores")
+    elif kind == "histogram":
+        plot_histogram(spec["edges"], spec["counts"], out_file, spec["bucket_width"])
+    elif kind == "series":
+        ax = _axes("Scores by Row", "Row", "Score")
+        ax.plot(spec["rows"], spec["scores"], color=BAR_COLOR, linewidth=0.8)
+        _save(out_file)
+    else:
+        raise ValueError(f"Unknown chart kind: {kind}")
+
+
+def plot_scores(df, out_file, kind="auto"):
+    """Chart the Name/Score frame in a representation suited to its size."""
+    draw_chart(chart_spec(kind, lambda: df["Name"].to_numpy(), df["Score"].to_numpy()), out_file)
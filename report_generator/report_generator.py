@@ -1,45 +1,46 @@
+import numpy as np
 import pandas as pd
 from fpdf import FPDF
-import matplotlib.pyplot as plt
+import argparse
 import os
+from columnar import ColumnarData, is_columnar
+from report_chart import KINDS, plot_scores
+from report_stats import ScoreStatistics
+from table_writer import format_column, write_rows
 
 DATA_FILE = "data.csv"
 CHART_FILE = "chart.png"
 REPORT_FILE = "report.pdf"
 
 
-def load_data(filename):
-    """Load and validate data from CSV."""
+def load_data(filename, columns=None):
+    """Load and validate data from CSV or a memory-mapped columnar directory.
+
+    Pass `columns` to read only what a report section needs; from a columnar
+    directory the other columns are never touched.
+    """
+    if is_columnar(filename):
+        data = ColumnarData(filename)
+        required = columns or ["Name", "Score"]
+        if any(name not in data.columns for name in required):
+            raise ValueError("Data must contain 'Name' and 'Score' columns.")
+        return data.frame(columns)
     if not os.path.isfile(filename):
         raise FileNotFoundError(f"File not found: {filename}")
-    df = pd.read_csv(filename)
-    if "Name" not in df.columns or "Score" not in df.columns:
+    df = pd.read_csv(filename, usecols=columns)
+    if any(name not in df.columns for name in columns or ["Name", "Score"]):
         raise ValueError("CSV must contain 'Name' and 'Score' columns.")
     return df
 
 
 def calc_statistics(df):
-    """Return key statistics as dict."""
-    return {
-        "Average": df["Score"].mean(),
-        "Highest": df["Score"].max(),
-        "Lowest": df["Score"].min(),
-        "Median": df["Score"].median(),
-        "StdDev": df["Score"].std(),
-        "Count": len(df),
-    }
-
-
-def plot_chart(df):
-    """Generate and save a bar chart."""
-    plt.figure(figsize=(7, 4))
-    plt.bar(df["Name"], df["Score"], color="#3b8eea")
-    plt.title("Student Scores", fontsize=14)
-    plt.xlabel("Name")
-    plt.ylabel("Score")
-    plt.tight_layout()
-    plt.savefig(CHART_FILE)
-    plt.close()
+    """Return key statistics as dict, computed in a single pass."""
+    return ScoreStatistics().update(df["Score"]).result()
+
+
+def plot_chart(df, kind="auto", out_file=CHART_FILE):
+    """Generate and save a chart: named bars for small data, a histogram otherwise."""
+    plot_scores(df, out_file, kind)
 
 
 class PDFReport(FPDF):
@@ -65,18 +66,27 @@ class PDFReport(FPDF):
             self.cell(0, 8, f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}", ln=1, fill=True)
         self.ln(2)
 
-    def add_scores_table(self, df):
+    def table_header(self):
         self.set_font("Arial", "B", 12)
         self.set_fill_color(200, 220, 255)
         self.cell(70, 10, "Name", 1, 0, "C", True)
         self.cell(40, 10, "Score", 1, 0, "C", True)
         self.ln()
         self.set_font("Arial", "", 11)
-        for i, row in df.iterrows():
-            fill = i % 2 == 0
-            self.cell(70, 8, row["Name"], 1, 0, "C", fill)
-            self.cell(40, 8, f"{row['Score']}", 1, 0, "C", fill)
-            self.ln()
+
+    def add_table_rows(self, names, scores, first_index=0, formatters=None, new_page=None):
+        """Striped Name/Score rows, formatted per column and written a page at a time.
+
+        `formatters` maps "Name"/"Score" to a function over the whole column.
+        """
+        formatters = formatters or {}
+        texts = [format_column(names, formatters.get("Name")), format_column(scores, formatters.get("Score"))]
+        fills = np.arange(first_index, first_index + len(texts[0])) % 2 == 0
+        write_rows(self, [(70, "C"), (40, "C")], texts, fills.tolist(), 8, new_page)
+
+    def add_scores_table(self, df, formatters=None):
+        self.table_header()
+        self.add_table_rows(df["Name"], df["Score"], formatters=formatters)
 
     def add_chart(self, chart_path):
         self.ln(5)
@@ -96,11 +106,48 @@ def generate_pdf(df, stats, chart_path, out_file):
     print(f"PDF report generated: {out_file}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the student score report.")
+    parser.add_argument("--input", default=DATA_FILE)
+    parser.add_argument("--output", default=REPORT_FILE)
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the CSV in chunks and write pages incrementally (bounded memory).")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Render streaming table pages across this many processes.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Streaming build that reuses cached pages for unchanged rows.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Build cache for --incremental (default: next to the output).")
+    parser.add_argument("--chart", choices=KINDS, default="auto",
+                        help="Chart type; 'auto' picks one based on the row count.")
+    parser.add_argument("--formats", default="pdf",
+                        help="Comma-separated outputs from pdf, html, json; all share one computed model.")
+    args = parser.parse_args()
     try:
-        df = load_data(DATA_FILE)
-        stats = calc_statistics(df)
-        plot_chart(df)
-        generate_pdf(df, stats, CHART_FILE, REPORT_FILE)
+        from report_model import ReportModel
+        from report_renderers import RENDERERS
+
+        formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+        unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+        if unknown:
+            raise ValueError(f"Unknown format(s): {', '.join(unknown)}")
+        model = ReportModel(args.input, args.chart)
+        base = os.path.splitext(args.output)[0]
+        for fmt in formats:
+            out_file = args.output if fmt == "pdf" else f"{base}.{fmt}"
+            if fmt != "pdf":
+                RENDERERS[fmt](model, out_file)
+            elif args.incremental:
+                from incremental_report import generate_incremental_pdf
+                generate_incremental_pdf(args.input, out_file, args.cache_dir, args.workers)
+            elif args.stream and args.workers:
+                from parallel_report import generate_parallel_pdf
+                generate_parallel_pdf(args.input, out_file, args.workers)
+            elif args.stream:
+                from streaming_report import generate_streaming_pdf
+                generate_streaming_pdf(args.input, out_file, args.chunk_size)
+            else:
+                RENDERERS[fmt](model, out_file)
     except Exception as e:
         print(f"Error: {e}")
 
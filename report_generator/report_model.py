@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_chunks
+from report_chart import chart_spec, choose_kind, draw_chart
+from report_stats import ScoreStatistics, stats_from_csv
+
+TITLE = "Student Score Analysis"
+CHUNK_ROWS = 100_000
+
+
+class ReportModel:
+    """Everything a report shows, computed once and shared by every renderer.
+
+    `data` is a Name/Score DataFrame or the path of a CSV file or columnar
+    directory. Statistics take one pass over the scores; the chart is
+    reduced to size-independent data; table rows are read lazily in
+    chunks, so a renderer that skips the table never pays for it.
+    """
+
+    def __init__(self, data, chart_kind="auto", title=TITLE):
+        if not isinstance(data, pd.DataFrame) and not os.path.exists(data):
+            raise FileNotFoundError(f"File not found: {data}")
+        self.data = data
+        self.chart_kind = chart_kind
+        self.title = title
+        self._statistics = None
+        self._chart = None
+        self._chart_files = {}
+
+    def _frame(self, columns):
+        if isinstance(self.data, pd.DataFrame):
+            return self.data
+        return pd.concat(list(read_chunks(self.data, CHUNK_ROWS, columns)), ignore_index=True)
+
+    @property
+    def statistics(self):
+        """ScoreStatistics over all rows, accumulated on first use."""
+        if self._statistics is None:
+            if isinstance(self.data, pd.DataFrame):
+                self._statistics = ScoreStatistics().update(self.data["Score"])
+            else:
+                self._statistics = stats_from_csv(self.data)
+            if self._statistics.count == 0:
+                raise ValueError("Data contains no rows.")
+        return self._statistics
+
+    @property
+    def stats(self):
+        return self.statistics.result()
+
+    @property
+    def row_count(self):
+        return self.statistics.count
+
+    @property
+    def chart(self):
+        """chart_spec for this data; histograms come straight from the statistics."""
+        if self._chart is None:
+            kind = self.chart_kind
+            if kind == "auto":
+                kind = choose_kind(self.row_count)
+            if kind == "histogram":
+                stats = self.statistics
+                self._chart = {"kind": kind, "edges": stats.edges, "counts": stats.counts,
+                               "bucket_width": stats.bucket_width}
+            else:
+                scores = self._frame(["Score"])["Score"].to_numpy()
+                self._chart = chart_spec(kind, lambda: self._frame(["Name"])["Name"].to_numpy(), scores)
+        return self._chart
+
+    def chart_file(self, path):
+        """Draw the chart to `path` once, however many renderers embed it."""
+        if path not in self._chart_files:
+            draw_chart(self.chart, path)
+            self._chart_files[path] = True
+        return path
+
+    def chart_data(self):
+        """The chart as plain lists, for serialisation."""
+        return {
+            key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in self.chart.items()
+        }
+
+    def table_chunks(self, chunk_rows=CHUNK_ROWS):
+        """Yield (first_index, names, scores) for the table, a chunk at a time."""
+        if isinstance(self.data, pd.DataFrame):
+            chunks = (self.data.iloc[start:start + chunk_rows]
+                      for start in range(0, len(self.data), chunk_rows))
+        else:
+            chunks = read_chunks(self.data, chunk_rows, ["Name", "Score"])
+        first_index = 0
+        for chunk in chunks:
+            if "Name" not in chunk.columns or "Score" not in chunk.columns:
+                raise ValueError("Data must contain 'Name' and 'Score' columns.")
+            yield first_index, chunk["Name"].tolist(), chunk["Score"].tolist()
+            first_index += len(chunk)
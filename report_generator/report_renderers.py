@@ -0,0 +1,97 @@
+import base64
+import html
+import json
+import math
+
+import numpy as np
+
+from report_generator import CHART_FILE, PDFReport
+from table_writer import format_scores
+
+
+def _plain(value):
+    """JSON-safe scalar: NumPy numbers unwrapped, NaN as null."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _plain_score(value):
+    """Like _plain, but whole-number scores read as floats stay integers."""
+    value = _plain(value)
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def _format(value):
+    return f"{value:.2f}" if isinstance(value, float) else f"{value}"
+
+
+def render_pdf(model, out_file, chart_path=CHART_FILE):
+    """The original PDF layout: summary, chart, then the full table."""
+    pdf = PDFReport()
+    pdf.add_page()
+    pdf.stats_box(model.stats)
+    pdf.ln(3)
+    pdf.add_chart(model.chart_file(chart_path))
+    pdf.ln(3)
+    pdf.table_header()
+    for first_index, names, scores in model.table_chunks():
+        pdf.add_table_rows(names, scores, first_index, formatters={"Score": format_scores})
+    pdf.output(out_file)
+    print(f"PDF report generated: {out_file}")
+
+
+def render_html(model, out_file, chart_path=CHART_FILE):
+    """A single self-contained HTML page; the table is written chunk by chunk."""
+    with open(model.chart_file(chart_path), "rb") as f:
+        chart = base64.b64encode(f.read()).decode("ascii")
+    title = html.escape(model.title)
+    with open(out_file, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>\n"
+                "<style>body{font-family:Arial,sans-serif;margin:2em}"
+                "table{border-collapse:collapse}td,th{border:1px solid #999;padding:2px 12px;text-align:center}"
+                "th{background:#c8dcff}tr:nth-child(even) td{background:#c8dcff}"
+                ".stats td{background:#e6f0ff;text-align:left}</style></head><body>\n")
+        f.write(f"<h1>{title}</h1>\n<h2>Summary Statistics</h2>\n<table class=\"stats\">\n")
+        for key, value in model.stats.items():
+            f.write(f"<tr><td>{html.escape(key)}</td><td>{_format(value)}</td></tr>\n")
+        f.write("</table>\n<h2>Scores Distribution</h2>\n"
+                f"<img alt=\"Scores chart\" src=\"data:image/png;base64,{chart}\">\n")
+        f.write("<h2>Scores</h2>\n<table>\n<tr><th>Name</th><th>Score</th></tr>\n")
+        for _, names, scores in model.table_chunks():
+            f.write("".join(
+                f"<tr><td>{html.escape(str(name))}</td><td>{score}</td></tr>\n"
+                for name, score in zip(names, format_scores(scores))
+            ))
+        f.write("</table>\n</body></html>\n")
+    print(f"HTML report generated: {out_file}")
+
+
+def render_json(model, out_file, include_rows=False):
+    """Statistics and chart data; table rows only if asked, as they dominate size."""
+    report = {
+        "title": model.title,
+        "stats": {key: _plain(value) for key, value in model.stats.items()},
+        "chart": model.chart_data(),
+    }
+    with open(out_file, "w", encoding="utf-8") as f:
+        if not include_rows:
+            json.dump(report, f, indent=2)
+        else:
+            f.write(json.dumps(report, indent=2)[:-2] + ',\n  "rows": [')
+            separator = "\n    "
+            for _, names, scores in model.table_chunks():
+                for name, score in zip(names, scores):
+                    f.write(separator + json.dumps({"Name": str(name), "Score": _plain_score(score)}))
+                    separator = ",\n    "
+            f.write("\n  ]\n}")
+    print(f"JSON report generated: {out_file}")
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "html": render_html,
+    "json": render_json,
+}
@@ -0,0 +1,122 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_chunks
+
+
+class ScoreStatistics:
+    """Single-pass, mergeable summary statistics for a score column.
+
+    Count, mean and variance are combined chunk by chunk with the
+    Chan/Welford update, so no pass ever needs the whole column. The median
+    comes from a fixed-bucket histogram over the score range; with the
+    default unit buckets and integer scores it is exact. Two accumulators
+    built on different chunks, files or processes can be merged.
+    """
+
+    def __init__(self, low=0, high=100, bucket_width=1):
+        self.low = low
+        self.high = high
+        self.bucket_width = bucket_width
+        self.edges = np.arange(low, high + bucket_width, bucket_width, dtype="float64")
+        self.counts = np.zeros(len(self.edges), dtype="int64")
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.lowest = None
+        self.highest = None
+        self.integral = True
+
+    def update(self, scores):
+        """Fold one chunk (array-like of numbers) into the statistics."""
+        values = np.asarray(scores)
+        values = values[~pd.isna(values)] if values.dtype.kind == "f" else values
+        n = len(values)
+        if n == 0:
+            return self
+
+        as_float = values.astype("float64")
+        chunk_mean = as_float.mean()
+        chunk_m2 = ((as_float - chunk_mean) ** 2).sum()
+        self._combine(n, chunk_mean, chunk_m2, values.min(), values.max())
+
+        buckets = np.floor((as_float - self.low) / self.bucket_width).astype("int64")
+        np.clip(buckets, 0, len(self.counts) - 1, out=buckets)
+        self.counts += np.bincount(buckets, minlength=len(self.counts))
+        if self.integral and values.dtype.kind not in "iu":
+            self.integral = bool(np.all(as_float == np.floor(as_float)))
+        return self
+
+    def _combine(self, n, mean, m2, lowest, highest):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.lowest = lowest if self.lowest is None else min(self.lowest, lowest)
+        self.highest = highest if self.highest is None else max(self.highest, highest)
+
+    def merge(self, other):
+        """Fold another accumulator with the same buckets into this one."""
+        if other.count == 0:
+            return self
+        if other.low != self.low or other.high != self.high or other.bucket_width != self.bucket_width:
+            raise ValueError("Cannot merge statistics with different histogram buckets.")
+        self._combine(other.count, other.mean, other.m2, other.lowest, other.highest)
+        self.counts += other.counts
+        self.integral = self.integral and other.integral
+        return self
+
+    def order_statistic(self, k):
+        """Approximate k-th smallest value (0-based) from the histogram."""
+        cumulative = np.cumsum(self.counts)
+        bucket = int(np.searchsorted(cumulative, k + 1))
+        if self.integral and self.bucket_width == 1:
+            value = self.edges[bucket]
+        else:
+            before = cumulative[bucket] - self.counts[bucket]
+            fraction = (k - before + 0.5) / self.counts[bucket]
+            value = self.edges[bucket] + fraction * self.bucket_width
+        return float(min(max(value, self.lowest), self.highest))
+
+    def median(self):
+        if self.count == 0:
+            return float("nan")
+        return (self.order_statistic((self.count - 1) // 2) + self.order_statistic(self.count // 2)) / 2
+
+    def std(self):
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else float("nan")
+
+    def result(self):
+        """Statistics in the shape calc_statistics has always returned."""
+        highest, lowest = self.highest, self.lowest
+        if self.count and self.integral:
+            # Whole-number scores read as floats still report as integers
+            highest, lowest = int(highest), int(lowest)
+        return {
+            "Average": float(self.mean) if self.count else float("nan"),
+            "Highest": highest,
+            "Lowest": lowest,
+            "Median": self.median(),
+            "StdDev": self.std(),
+            "Count": self.count,
+        }
+
+
+def stats_from_csv(filename, chunk_size=1_000_000, column="Score"):
+    """Accumulate statistics over a CSV or columnar directory read in chunks."""
+    stats = ScoreStatistics()
+    for chunk in read_chunks(filename, chunk_size, [column]):
+        stats.update(chunk[column])
+    return stats
+
+
+def stats_from_shards(filenames, workers=None, chunk_size=1_000_000):
+    """Accumulate each CSV shard in its own process and merge the results."""
+    total = ScoreStatistics()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(stats_from_csv, filenames, [chunk_size] * len(filenames)):
+            total.merge(partial)
+    return total
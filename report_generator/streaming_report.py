@@ -0,0 +1,220 @@
+import os
+import tempfile
+
+from columnar import read_chunks
+from report_chart import plot_histogram
+from report_generator import PDFReport
+from report_stats import ScoreStatistics
+from table_writer import format_scores
+
+ROW_HEIGHT = 8
+
+
+class FileBuffer:
+    """Stand-in for FPDF's string buffer that writes straight to a file.
+
+    FPDF only ever appends to its buffer (`+=`) and reads its length to
+    record object offsets, so both are all this needs to support.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.length = 0
+
+    def __iadd__(self, s):
+        data = s.encode("latin1")
+        self.f.write(data)
+        self.length += len(data)
+        return self
+
+    def __len__(self):
+        return self.length
+
+
+class SpooledPages:
+    """Stand-in for FPDF's page dict that keeps one page in memory.
+
+    FPDF appends to the current page with `pages[n] += ...`. When the next
+    page starts, the finished one is spilled to a temporary file. When
+    FPDF reads the pages back while writing the document, `order` can
+    present them in a different order from the one they were rendered in.
+    """
+
+    def __init__(self):
+        self.spool = tempfile.TemporaryFile()
+        self.locations = {}
+        self.current = None
+        self.content = ''
+        self.order = None
+
+    def _spill(self):
+        if self.current is None:
+            return
+        data = self.content.encode("latin1")
+        self.spool.seek(0, os.SEEK_END)
+        self.locations[self.current] = (self.spool.tell(), len(data))
+        self.spool.write(data)
+        self.current = None
+        self.content = ''
+
+    def __setitem__(self, n, content):
+        if n != self.current:
+            self._spill()
+            self.current = n
+        self.content = content
+
+    def __getitem__(self, n):
+        if self.order is not None:
+            n = self.order[n]
+        if n == self.current:
+            return self.content
+        offset, length = self.locations[n]
+        self.spool.seek(offset)
+        return self.spool.read(length).decode("latin1")
+
+    def __contains__(self, n):
+        return n == self.current or n in self.locations
+
+    def close(self):
+        self.spool.close()
+
+
+class StreamingPDFReport(PDFReport):
+    """PDFReport that spools finished pages to disk and streams its output.
+
+    Peak memory stays at about one page, whatever the row count. Table
+    pages are rendered first and numbered from 2. The summary page, whose
+    statistics are only known once every row has been read, is rendered
+    last and then moved to the front when the document is written.
+
+    Every table page starts from the same graphics state and the document
+    carries no creation date, so a page's bytes depend only on its rows and
+    number. That lets pages be rendered in separate processes and stitched
+    together into the same file a serial build writes.
+    """
+
+    def __init__(self, out_file=None, page_number_offset=1):
+        super().__init__()
+        self.out = open(out_file, "wb") if out_file else None
+        if self.out:
+            self.buffer = FileBuffer(self.out)
+        self.pages = SpooledPages()
+        self.summary_page = None
+        self.page_number_offset = page_number_offset
+        # Register fonts in a fixed order and leave the state every table
+        # page ends in, so the first page matches any later one
+        self.set_font("Arial", "B", 12)
+        self.set_font("Arial", "I", 9)
+        self.set_font("Arial", "", 11)
+        self.set_fill_color(200, 220, 255)
+
+    def page_no(self):
+        if self.page == self.summary_page:
+            return 1
+        return self.page + self.page_number_offset
+
+    def footer(self):
+        # Pages rendered elsewhere already carry their footer
+        if self.state == 2:
+            super().footer()
+
+    def _putinfo(self):
+        # No /CreationDate: the same input must give the same bytes
+        self._out('/Producer ' + self._textstring('PyFPDF'))
+
+    def end_page(self):
+        """Close the current page, footer included, without starting another."""
+        self.in_footer = 1
+        self.footer()
+        self.in_footer = 0
+        self._endpage()
+
+    def rendered_pages(self):
+        return [self.pages[n] for n in range(1, self.page + 1)]
+
+    def append_rendered_pages(self, contents):
+        """Append finished page contents produced by another instance."""
+        if self.state == 0:
+            self.open()
+        for content in contents:
+            self.page += 1
+            self.pages[self.page] = content
+
+    def add_rows(self, names, scores, first_index):
+        self.add_table_rows(names, scores, first_index, formatters={"Score": format_scores},
+                            new_page=self.new_table_page)
+
+    def new_table_page(self):
+        self.add_page()
+        self.table_header()
+
+    def add_summary_page(self, stats):
+        """Render the summary last; it is moved to the front on output.
+
+        `stats` is the ScoreStatistics accumulated over the table, whose
+        bucket counts are charted directly instead of re-reading the rows.
+        """
+        self.summary_page = self.page + 1
+        self.add_page()
+        self.stats_box(stats.result())
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
+            chart_path = f.name
+        try:
+            plot_histogram(stats.edges, stats.counts, chart_path, stats.bucket_width)
+            self.add_chart(chart_path)
+        finally:
+            os.remove(chart_path)
+
+    def _putpages(self):
+        if self.summary_page is not None:
+            order = {1: self.summary_page}
+            order.update({n: n - 1 for n in range(2, self.summary_page + 1)})
+            self.pages.order = order
+        super()._putpages()
+
+    def finish(self):
+        try:
+            self.close()
+        finally:
+            self.pages.close()
+            self.out.close()
+
+    def abort(self):
+        """Discard a half-written report."""
+        self.pages.close()
+        if self.out:
+            self.out.close()
+            os.remove(self.out.name)
+
+
+def rows_per_page():
+    """Table rows that fit on one page under the standard layout."""
+    pdf = StreamingPDFReport()
+    pdf.add_page()
+    pdf.table_header()
+    return int((pdf.page_break_trigger - pdf.y) // ROW_HEIGHT)
+
+
+def generate_streaming_pdf(data_file, out_file, chunk_size=100_000):
+    """Build the report from `data_file` in chunks with bounded memory."""
+    if not os.path.exists(data_file):
+        raise FileNotFoundError(f"File not found: {data_file}")
+
+    pdf = StreamingPDFReport(out_file)
+    stats = ScoreStatistics()
+    row_index = 0
+    try:
+        for chunk in read_chunks(data_file, chunk_size):
+            if "Name" not in chunk.columns or "Score" not in chunk.columns:
+                raise ValueError("CSV must contain 'Name' and 'Score' columns.")
+            stats.update(chunk["Score"])
+            pdf.add_rows(chunk["Name"].tolist(), chunk["Score"].tolist(), row_index)
+            row_index += len(chunk)
+        if stats.count == 0:
+            raise ValueError("CSV contains no rows.")
+        pdf.add_summary_page(stats)
+    except BaseException:
+        pdf.abort()
+        raise
+    pdf.finish()
+    print(f"PDF report generated: {out_file}")
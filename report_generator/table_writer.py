@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# Rows formatted together; bounds the per-cell scratch lists
+BLOCK_ROWS = 8192
+
+
+def format_column(values, formatter=None):
+    """Cell text for a whole column at once.
+
+    `formatter` is applied to the column as a Series and must return
+    something list-like of the same length; by default values are shown
+    as str() would show them.
+    """
+    if formatter is not None:
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        return list(formatter(series))
+    array = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if array.dtype.kind in "biuf":
+        return array.astype(str).tolist()
+    return [value if isinstance(value, str) else str(value) for value in array]
+
+
+def format_scores(scores):
+    """Scores as text: whole numbers without ".0", blanks left empty.
+
+    Integer and float columns of the same values give the same text, so a
+    table does not depend on how its rows were split into chunks.
+    """
+    values = pd.Series(scores).to_numpy(dtype="float64", na_value=np.nan)
+    texts = values.astype(str)
+    whole = np.isfinite(values) & (values == np.round(values)) & (np.abs(values) < 2 ** 53)
+    texts[whole] = values[whole].astype("int64").astype(str)
+    texts[np.isnan(values)] = ""
+    return texts.tolist()
+
+
+def _string_widths(pdf, texts):
+    """get_string_width for every string, from one lookup over the joined text."""
+    cw = pdf.current_font["cw"]
+    table = np.array([cw.get(chr(i), 0) for i in range(256)], dtype=np.int64)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    chars = np.frombuffer("".join(texts).encode("latin1"), dtype=np.uint8)
+    totals = np.concatenate(([0], np.cumsum(table[chars])))
+    ends = np.cumsum(lengths)
+    units = totals[ends] - totals[ends - lengths]
+    return units * pdf.font_size / 1000.0
+
+
+def _escaped(pdf, texts):
+    if any(c in "".join(texts) for c in "\\()\r"):
+        return [pdf._escape(text) for text in texts]
+    return texts
+
+
+def write_rows(pdf, columns, texts, fills, row_height, new_page=None):
+    """Write bordered table rows as raw PDF operators, a page at a time.
+
+    `columns` is a list of (width, align) pairs and `texts` the matching
+    list of per-column strings. The content is exactly what one
+    `cell(width, row_height, text, 1, 0, align, fill)` per cell followed
+    by `ln()` per row would produce, but font and colour state is only set
+    when a page starts and each page's rows are formatted and appended in
+    one go. `new_page` starts a page (and e.g. repeats a header); by
+    default it is FPDF's own automatic page break.
+    """
+    if new_page is None:
+        def new_page():
+            pdf.add_page(pdf.cur_orientation)
+    texts = [list(column) for column in texts]
+    for start in range(0, len(fills), BLOCK_ROWS):
+        stop = start + BLOCK_ROWS
+        _write_block(pdf, columns, [column[start:stop] for column in texts],
+                     fills[start:stop], row_height, new_page)
+
+
+def _write_block(pdf, columns, texts, fills, row_height, new_page):
+    n = len(fills)
+    k = pdf.k
+    h = row_height
+    half_row, baseline = .5 * h, .3 * pdf.font_size
+    if pdf.color_flag:
+        text_format = "q " + pdf.text_color + " BT %s %s Td (%s) Tj ET Q"
+    else:
+        text_format = "BT %s %s Td (%s) Tj ET"
+
+    # Per-column constants and per-cell text offsets
+    cells = []
+    x = pdf.l_margin
+    for (w, align), column in zip(columns, texts):
+        widths = _string_widths(pdf, column)
+        if align == "R":
+            dx = w - pdf.c_margin - widths
+        elif align == "C":
+            dx = (w - widths) / 2.0
+        else:
+            dx = np.full(n, float(pdf.c_margin))
+        text_x = [f"{value:.2f}" for value in ((x + dx) * k).tolist()]
+        empty = [text == "" for text in column]
+        cells.append((f"{x * k:.2f}", f"{w * k:.2f} {-h * k:.2f} re", text_x, _escaped(pdf, column), empty))
+        x += w
+    ops = ["B" if fill else "S" for fill in fills]
+
+    row = 0
+    while row < n:
+        if pdf.page == 0 or pdf.y + h > pdf.page_break_trigger:
+            new_page()
+        # Same sequential float additions as repeated ln() calls
+        room = min(n - row, int((pdf.page_break_trigger - pdf.y) / h) + 1)
+        ys = np.cumsum(np.concatenate(([pdf.y], np.full(room, h))))
+        fit = max(1, int(np.searchsorted(ys[1:], pdf.page_break_trigger, side="right")))
+        stop = min(n, row + fit)
+        lines = []
+        for i, y in enumerate(ys[:stop - row].tolist(), row):
+            rect_y = f"{(pdf.h - y) * k:.2f}"
+            text_y = f"{(pdf.h - (y + half_row + baseline)) * k:.2f}"
+            for rect_x, rect_rest, text_x, column, empty in cells:
+                rect = f"{rect_x} {rect_y} {rect_rest} {ops[i]} "
+                lines.append(rect if empty[i] else rect + text_format % (text_x[i], text_y, column[i]))
+        pdf._out("\n".join(lines))
+        pdf.y = ys[stop - row]
+        pdf.x = pdf.l_margin
+        pdf.lasth = h
+        row = stop
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from incremental_report import generate_incremental_pdf
+from streaming_report import generate_streaming_pdf, rows_per_page
+
+PAGES_PER_SHARD = 2
+
+
+def write_scores(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 101, rows)
+    pd.DataFrame({"Name": [f"Student {i}" for i in range(rows)], "Score": scores}).to_csv(path, index=False)
+
+
+def assert_same_report(tmp_path, csv_file, chunk_size):
+    generate_streaming_pdf(str(csv_file), str(tmp_path / "streaming.pdf"), chunk_size=chunk_size)
+    generate_incremental_pdf(str(csv_file), str(tmp_path / "incremental.pdf"),
+                             pages_per_shard=PAGES_PER_SHARD)
+    assert (tmp_path / "incremental.pdf").read_bytes() == (tmp_path / "streaming.pdf").read_bytes()
+
+
+# Only some shards and chunks see the blank or decimal score, so guessed
+# dtypes would differ between them
+@pytest.mark.parametrize("tail", ["ZZZ,55\nYYY,\n", "ZZZ,55\nYYY,87.5\n"])
+@pytest.mark.parametrize("chunk_size", [50, 100_000])
+def test_matches_streaming_build(tmp_path, tail, chunk_size):
+    csv_file = tmp_path / "scores.csv"
+    write_scores(csv_file, rows_per_page() * PAGES_PER_SHARD * 3)
+    with open(csv_file, "a") as f:
+        f.write(tail)
+    assert_same_report(tmp_path, csv_file, chunk_size)
+
+
+def test_appended_rows_reuse_shards_and_match(tmp_path, capsys):
+    csv_file = tmp_path / "scores.csv"
+    write_scores(csv_file, rows_per_page() * PAGES_PER_SHARD * 3)
+    assert_same_report(tmp_path, csv_file, 100_000)
+    with open(csv_file, "a") as f:
+        f.write("ZZZ,12.5\nYYY,\n")
+    assert_same_report(tmp_path, csv_file, 100_000)
+    assert "3 of 4 shards reused" in capsys.readouterr().out